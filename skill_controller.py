@@ -3,7 +3,8 @@ Skill Controller - Enforcement layer para prevenir alucinaciones.
 
 REGLAS CRITICAS:
 1. Skills DEBEN existir en registry (no alucinaciones)
-2. Steps se ejecutan SECUENCIALMENTE (no se puede saltear)
+2. Steps se ejecutan EN ORDEN (no se puede saltear): secuencial, o por
+   dependencias (depends_on) con steps independientes en paralelo
 3. Context7 es OBLIGATORIO si skill.context7_required esta presente
 4. Verification es OBLIGATORIA (no se puede decir "termine" sin verificar)
 5. Rollback AUTOMATICO si un step falla
@@ -13,38 +14,536 @@ Version: 1.0.0
 Created: 2026-01-19
 """
 
+import atexit
+import hashlib
+import importlib.util
 import json
+import queue
+import re
+import shlex
 import shutil
+import signal
 import subprocess
 import logging
 import os
 import sys
+import threading
+import time
+import weakref
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Callable
+from string import Formatter
+from typing import IO, Dict, Any, Optional, List, Callable, Set, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 
-# Conditional import for jsonschema
+# Conditional import for jsonschema, deferred to first use: it is slow to
+# import and the compiled fastjsonschema validator usually makes it unneeded
+HAS_JSONSCHEMA = importlib.util.find_spec("jsonschema") is not None
+jsonschema = None  # type: ignore  # Set by _import_jsonschema()
+
+# Conditional import for fastjsonschema (generates plain-Python validators)
 try:
-    import jsonschema
+    import fastjsonschema
 
-    HAS_JSONSCHEMA = True
+    HAS_FASTJSONSCHEMA = True
 except ImportError:
-    jsonschema = None  # type: ignore
-    HAS_JSONSCHEMA = False
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-    ],
-)
+    fastjsonschema = None  # type: ignore
+    HAS_FASTJSONSCHEMA = False
+
+# Conditional import for orjson (faster JSON parsing)
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None  # type: ignore
+    HAS_ORJSON = False
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError: same except clauses work
+_json_loads: Callable[[Any], Any] = orjson.loads if HAS_ORJSON else json.loads  # type: ignore[union-attr]
+
+
+def _dump_record(record: Dict[str, Any]) -> bytes:
+    """Serialize one execution-log record as a UTF-8 JSON Lines line."""
+    if HAS_ORJSON:
+        # Values JSON can't represent (Paths, datetimes...) are written as str
+        return orjson.dumps(  # type: ignore[union-attr]
+            record,
+            option=orjson.OPT_APPEND_NEWLINE,  # type: ignore[union-attr]
+            default=str,
+        )
+    line = json.dumps(record, separators=(",", ":"), ensure_ascii=False, default=str)
+    return (line + "\n").encode("utf-8")
+
+
+def _write_bytes(path: str, data: bytes, append: bool = False) -> None:
+    """Write data to path with raw os.write calls (no buffered file object)."""
+    mode = os.O_APPEND if append else os.O_TRUNC
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | mode, 0o644)
+    try:
+        # Normally a single syscall; os.write may write less than asked.
+        # Slicing a memoryview re-points at the same buffer (no copies).
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def _create_log_file(base: str) -> str:
+    """
+    Create a new, empty execution log named base.jsonl and return its path.
+
+    Runs of the same skill within one second share base: later ones get
+    base_2.jsonl, base_3.jsonl... (O_EXCL, so concurrent runs never share
+    a file).
+    """
+    path = base + ".jsonl"
+    n = 1
+    while True:
+        try:
+            os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+            return path
+        except FileExistsError:
+            n += 1
+            path = f"{base}_{n}.jsonl"
+
+
 logger = logging.getLogger("SkillController")
+# Library use: silent unless the application configures logging (the CLIs
+# call configure_logging)
+logger.addHandler(logging.NullHandler())
+
+_console_handler: Optional[logging.Handler] = None
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Send log records to stdout (called by the CLI entry points).
+
+    Records are written synchronously, in order with the CLI's own print()
+    output. Calling it again does nothing.
+    """
+    global _console_handler
+    if _console_handler is not None:
+        return
+    _console_handler = logging.StreamHandler(sys.stdout)
+    _console_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    root = logging.getLogger()
+    root.addHandler(_console_handler)
+    root.setLevel(level)
+
+
+# Execution logs are serialized by the caller and written by one background
+# thread shared by every controller; _flush_logs() waits until nothing is
+# pending. The thread starts with the first queued record.
+_log_queue: "queue.SimpleQueue[Tuple[str, bytes, bool]]" = queue.SimpleQueue()
+_logs_pending = 0
+_logs_cond = threading.Condition()
+_log_thread: Optional[threading.Thread] = None
+
+
+def _queue_log_write(log_file: str, payload: bytes, last: bool) -> None:
+    """Queue bytes to append to an execution log (last: the log is complete)."""
+    global _logs_pending, _log_thread
+    with _logs_cond:
+        _logs_pending += 1
+        if _log_thread is None:
+            _log_thread = threading.Thread(
+                target=_drain_logs, name="skill-log-writer", daemon=True
+            )
+            _log_thread.start()
+            atexit.register(_flush_logs)
+    _log_queue.put((log_file, payload, last))
+
+
+def _drain_logs() -> None:
+    """Log writer thread: write queued execution logs in batches."""
+    global _logs_pending
+    while True:
+        # Block for one entry, then take whatever else is already queued
+        batch = [_log_queue.get()]
+        while len(batch) < _LOG_BATCH_SIZE:
+            try:
+                batch.append(_log_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        # Consecutive records of the same log go out in one write
+        i = 0
+        while i < len(batch):
+            log_file, _, _ = batch[i]
+            j = i
+            while j < len(batch) and batch[j][0] == log_file:
+                j += 1
+            try:
+                payload = b"".join(entry[1] for entry in batch[i:j])
+                _write_bytes(log_file, payload, append=True)
+                if batch[j - 1][2]:
+                    logger.info("\nLog saved: %s", log_file)
+            except Exception as e:
+                logger.error(f"Could not write log {log_file}: {e}")
+            i = j
+
+        # One wake-up per batch for _flush_logs() waiters
+        with _logs_cond:
+            _logs_pending -= len(batch)
+            if _logs_pending == 0:
+                _logs_cond.notify_all()
+
+
+def _flush_logs() -> None:
+    """Block until every queued execution log record has been written."""
+    with _logs_cond:
+        _logs_cond.wait_for(lambda: _logs_pending == 0)
+
+
+# Input keys containing any of these substrings are redacted in logs
+_SENSITIVE_KEYS = (
+    "password",
+    "secret",
+    "token",
+    "api_key",
+    "apikey",
+    "api-key",
+    "private_key",
+    "privatekey",
+    "auth",
+    "credential",
+    "credentials",
+    "access_key",
+    "secret_key",
+    "bearer",
+    "jwt",
+    "session",
+)
+_SENSITIVE_KEY_RE = re.compile("|".join(map(re.escape, _SENSITIVE_KEYS)))
+
+_FORMATTER = Formatter()
+
+# Bytes of output kept per stream for bash/python steps (older output is
+# dropped), and the size of each read from their pipes
+_OUTPUT_TAIL_BYTES = 64 * 1024
+_PIPE_READ_BYTES = 64 * 1024
 
+# Lines of that tail kept once decoded (a line longer than the byte cap
+# keeps only its last bytes)
+_OUTPUT_TAIL_LINES = 200
 
-@dataclass
+# Characters of step output kept in StepResult.output and the execution log:
+# the end of bash/python output (like the tail above), the start of
+# agent/mcp return values
+_STEP_OUTPUT_CHARS = 1000
+
+
+# Seconds a command_exists result is reused across execute_skill calls
+_PREREQ_TTL_S = 5.0
+
+# Most execution logs the writer thread takes off its queue in one go
+_LOG_BATCH_SIZE = 16
+
+# PATH lookups repeat across prerequisites and skill runs: found commands
+# are remembered (up to _WHICH_CACHE_SIZE), misses are looked up again
+_WHICH_CACHE_SIZE = 256
+_which_found: Dict[str, str] = {}
+
+
+def _which(cmd: str) -> Optional[str]:
+    """shutil.which, caching hits only (a command installed later is found)."""
+    path = _which_found.get(cmd)
+    if path is None:
+        path = shutil.which(cmd)
+        if path is not None:
+            if len(_which_found) >= _WHICH_CACHE_SIZE:
+                _which_found.clear()
+            _which_found[cmd] = path
+    return path
+
+
+# Anything the shell would interpret: quoting, expansion, redirection,
+# control operators, globs, comments, assignments, line breaks
+_SHELL_META_RE = re.compile(r"[|&;<>()$`\\\"'*?\[\]{}#~=%!\n]")
+
+# Shell builtins/keywords that have no executable to run directly
+_SHELL_BUILTINS = frozenset(
+    ". : alias case cd command eval exec exit export for function if read return "
+    "set shift source trap ulimit umask unset until wait while".split()
+)
+
+
+def _split_simple_command(cmd: str) -> Optional[List[str]]:
+    """
+    Return argv for cmd if it can run without a shell, else None.
+
+    Only plain "program arg arg" commands qualify, and only on POSIX (cmd.exe
+    splits arguments differently). The program must resolve on PATH, so a
+    missing command still fails the way /bin/sh reports it.
+    """
+    if os.name != "posix" or _SHELL_META_RE.search(cmd):
+        return None
+    argv = shlex.split(cmd)
+    if not argv or argv[0] in _SHELL_BUILTINS or "/" in argv[0]:
+        return None
+    if _which(argv[0]) is None:
+        return None
+    return argv
+
+
+# Type mapping for input validation
+_INPUT_TYPES: Dict[str, Any] = {
+    "string": str,
+    "str": str,
+    "integer": int,
+    "int": int,
+    "number": (int, float),
+    "float": float,
+    "boolean": bool,
+    "bool": bool,
+    "array": list,
+    "list": list,
+    "object": dict,
+    "dict": dict,
+}
+
+
+# A template pre-parsed by parse_template (the template and validator helpers
+# below are shared with workflow_controller)
+ParsedTemplate = Union[str, List[Tuple[str, Optional[str]]], None]
+
+
+def parse_template(template: str) -> ParsedTemplate:
+    """
+    Pre-parse a str.format template into (literal, field_name) pairs.
+
+    Templates without fields come back as their final text (a plain str).
+    Returns None for templates that need the full str.format machinery
+    (conversions, format specs, attribute/index lookups, malformed braces).
+    """
+    parts = []
+    try:
+        for literal, field_name, format_spec, conversion in _FORMATTER.parse(template):
+            if field_name is not None and (
+                format_spec or conversion or not field_name.isidentifier()
+            ):
+                return None
+            parts.append((literal, field_name))
+    except ValueError:
+        return None
+    if not any(name for _, name in parts):
+        # Static: nothing to substitute, "{{"/"}}" already unescaped
+        return "".join(literal for literal, _ in parts)
+    return parts
+
+
+def render_template(template: str, parts: ParsedTemplate, inputs: Dict) -> str:
+    """Render a template parsed by parse_template (KeyError on missing input)."""
+    if parts is None:
+        return template.format(**inputs)
+    if isinstance(parts, str):
+        return parts
+    return "".join(
+        literal + (str(inputs[name]) if name else "") for literal, name in parts
+    )
+
+
+_SKILL_NAME_RE = re.compile(rb'"name"\s*:\s*"([^"\\]+)"')
+
+# Bytes read from the top of skill.json to find its name
+_NAME_PEEK_BYTES = 512
+
+
+def _read_skill_file(skill_json: Path) -> Tuple[bytes, os.stat_result]:
+    """Read a skill.json and stat it through the same open file."""
+    with open(skill_json, "rb") as f:
+        return f.read(), os.fstat(f.fileno())
+
+
+def _peek_skill_name(skill_json: Path) -> Optional[str]:
+    """
+    Read the skill name from the start of skill.json without parsing it.
+
+    The first "name" found may belong to a nested object (an input, a
+    step), so it is only trusted when it matches the skill's directory name
+    (the SKILLS/<name>/skill.json convention).
+
+    Returns None if no such name is found (or the file can't be read); the
+    caller then falls back to a full load, which reports any error.
+    """
+    try:
+        with open(skill_json, "rb") as f:
+            head = f.read(_NAME_PEEK_BYTES)
+        match = _SKILL_NAME_RE.search(head)
+        if match is None:
+            return None
+        name = match.group(1).decode("utf-8")
+        return name if name == skill_json.parent.name else None
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _drain_pipe(
+    pipe: IO[bytes], tail: bytearray, step_id: str, errors: List[BaseException]
+) -> None:
+    """
+    Read a process pipe in chunks, keeping its last _OUTPUT_TAIL_BYTES bytes.
+
+    Memory stays bounded however the output is split into lines. Runs in a
+    reader thread: an exception is appended to errors for the caller to
+    raise instead of being lost with the thread.
+    """
+    # Checked once per stream: lines are only split out for DEBUG logging
+    debug = logger.isEnabledFor(logging.DEBUG)
+    partial = b""  # DEBUG: unfinished last line, logged once complete
+    try:
+        with pipe:
+            while True:
+                chunk = pipe.read(_PIPE_READ_BYTES)
+                if not chunk:
+                    break
+                tail.extend(chunk)
+                if len(tail) > _OUTPUT_TAIL_BYTES:
+                    del tail[:-_OUTPUT_TAIL_BYTES]
+                if debug:
+                    *lines, partial = (partial + chunk).split(b"\n")
+                    if len(partial) > _OUTPUT_TAIL_BYTES:
+                        lines.append(partial)  # Don't buffer a huge line
+                        partial = b""
+                    for line in lines:
+                        logger.debug(
+                            "    [%s] %s", step_id, _decode_output(line).rstrip()
+                        )
+            if debug and partial:
+                logger.debug("    [%s] %s", step_id, _decode_output(partial).rstrip())
+    except Exception as e:
+        errors.append(e)
+
+
+def _decode_output(data: Union[bytes, bytearray]) -> str:
+    """Decode step output; bytes that aren't valid UTF-8 become U+FFFD."""
+    return data.decode("utf-8", errors="replace")
+
+
+def _output_tail(data: bytearray) -> str:
+    """Decode a step's output tail, keeping its last _OUTPUT_TAIL_LINES lines."""
+    text = _decode_output(data)
+    lines = text.splitlines(keepends=True)
+    if len(lines) > _OUTPUT_TAIL_LINES:
+        text = "".join(lines[-_OUTPUT_TAIL_LINES:])
+    return text
+
+
+def _kill_session(proc: subprocess.Popen) -> None:
+    """Kill a step process and anything it started (see _run_streaming)."""
+    if os.name != "posix":
+        proc.kill()
+        return
+    try:
+        # The session's process group id is the leader's pid; the id isn't
+        # reused while any process in the group is still alive
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass  # Everything in it has already exited
+
+
+def _import_jsonschema() -> Any:
+    """Import jsonschema on first use (only call when HAS_JSONSCHEMA)."""
+    global jsonschema
+    if jsonschema is None:
+        import jsonschema as module
+
+        jsonschema = module
+    return jsonschema
+
+
+def _validator_cache_dir() -> Optional[Path]:
+    """
+    Per-user directory for generated validator modules, or None.
+
+    The modules are imported (executed), so unlike the workspace output
+    directories this one must be private: owned by the current user and not
+    writable by anyone else. None (no disk cache) if that can't be ensured.
+    """
+    if os.name != "posix":
+        return None
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    cache_dir = Path(base, "agent-orchestration", "validators")
+    try:
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = cache_dir.stat()
+    except OSError:
+        return None
+    if st.st_uid != os.getuid() or st.st_mode & 0o022:
+        return None
+    return cache_dir
+
+
+def _is_private_file(path: Path) -> bool:
+    """True if path exists, belongs to this user and only they can write it."""
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def load_compiled_validator(
+    schema: Dict, detailed_exceptions: bool = True
+) -> Callable[[Any], Any]:
+    """
+    Return a fastjsonschema validator for schema, caching the generated code.
+
+    The generated module is keyed by a hash of the schema, the compile
+    options, the fastjsonschema version and the Python version, so later
+    process starts import it instead of compiling again (and an upgrade of
+    either compiles fresh code). It is kept in a per-user private directory
+    (see _validator_cache_dir); without one, the schema is compiled in
+    memory every time.
+    With detailed_exceptions=False the generated checks skip building error
+    messages, which is cheaper when another backend reports the details.
+    """
+    cache_dir = _validator_cache_dir()
+    if cache_dir is None:
+        # use_default=False: validation must not inject defaults into skills
+        return fastjsonschema.compile(  # type: ignore[union-attr]
+            schema, use_default=False, detailed_exceptions=detailed_exceptions
+        )
+
+    digest = hashlib.sha256(
+        json.dumps(
+            [
+                schema,
+                detailed_exceptions,
+                fastjsonschema.VERSION,  # type: ignore[union-attr]
+                sys.version_info[:2],
+            ],
+            sort_keys=True,
+        ).encode("utf-8")
+    ).hexdigest()[:16]
+    module_path = cache_dir / f"_validator_{digest}.py"
+
+    if not _is_private_file(module_path):
+        code = fastjsonschema.compile_to_code(  # type: ignore[union-attr]
+            schema, use_default=False, detailed_exceptions=detailed_exceptions
+        )
+        func_name = re.search(r"^def (\w+)\(", code, re.MULTILINE).group(1)  # type: ignore[union-attr]
+        tmp_path = module_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(f"{code}\n\nvalidate = {func_name}\n", encoding="utf-8")
+        os.replace(tmp_path, module_path)
+
+    spec = importlib.util.spec_from_file_location(module_path.stem, module_path)
+    module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module.validate
+
+
+@dataclass(slots=True)
 class StepResult:
     """Result of a single step execution."""
 
@@ -56,7 +555,7 @@ class StepResult:
     retries_used: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class SkillResult:
     """Result of complete skill execution."""
 
@@ -69,11 +568,114 @@ class SkillResult:
     log_file: Optional[str] = None
     error: Optional[str] = None
     outputs: Dict[str, Any] = field(default_factory=dict)
+    completed_count: int = field(init=False, default=0)
+    failed_count: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        # Counted once; callers that only need totals skip the lists
+        self.completed_count = len(self.steps_completed)
+        self.failed_count = len(self.steps_failed)
 
     def to_dict(self) -> Dict:
         return asdict(self)
 
 
+@dataclass(slots=True)
+class ExecutionLog:
+    """
+    Execution log of one skill run.
+
+    Written to output_dir as JSON Lines while the skill runs: a header
+    record, one record per step and a closing summary record.
+    """
+
+    timestamp: str
+    skill: str
+    version: str
+    autonomy: str
+    inputs: Dict[str, Any]
+    dry_run: bool
+    log_file: Optional[str] = None  # None: nothing is written (dry run)
+    error: Optional[str] = None
+    verification_failed: Optional[Dict[str, Any]] = None
+    verification: Optional[Dict[str, Any]] = None
+    success: bool = False
+    total_duration_ms: int = 0
+    steps_completed: List[str] = field(default_factory=list)
+    steps_failed: List[str] = field(default_factory=list)
+
+    def header(self) -> Dict[str, Any]:
+        return {
+            "_type": "header",
+            "timestamp": self.timestamp,
+            "skill": self.skill,
+            "version": self.version,
+            "autonomy": self.autonomy,
+            "inputs": self.inputs,
+            "dry_run": self.dry_run,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        failed_check = self.verification_failed
+        if failed_check is not None:
+            # Drop the precompiled template fields (_cmd_parsed, ...)
+            failed_check = {
+                k: v for k, v in failed_check.items() if not k.startswith("_")
+            }
+        return {
+            "_type": "summary",
+            "success": self.success,
+            "total_duration_ms": self.total_duration_ms,
+            "steps_completed": self.steps_completed,
+            "steps_failed": self.steps_failed,
+            "error": self.error,
+            "verification_failed": failed_check,
+            "verification": self.verification,
+        }
+
+
+@dataclass(slots=True)
+class _SkillCacheFile:
+    """
+    Contents of .skill_cache.json (see SkillController.__init__).
+
+    Kept apart from the controller so the finalizer that saves it holds
+    this data, not the controller: a collected controller still saves.
+    """
+
+    path: Path
+    schema_digest: Optional[str]
+    # Validated files: {path: {mtime_ns, size, sha256}}, read on first use
+    skills: Optional[Dict[str, Dict[str, Any]]] = None
+    # The controller's current discovery: {path: ((mtime_ns, size), name)}
+    discovered: Dict[str, Tuple[Tuple[int, int], str]] = field(default_factory=dict)
+    # Discovery read from the file: {path: [mtime_ns, size, name]}
+    saved_discovery: Dict[str, List[Any]] = field(default_factory=dict)
+    dirty: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def save(self) -> None:
+        """Persist the cache if it changed (also runs at exit or collection)."""
+        with self.lock:
+            if not self.dirty or self.skills is None:
+                return
+            data = {
+                "schema": self.schema_digest,
+                "skills": self.skills,
+                "discovered": {
+                    path: [version[0], version[1], name]
+                    for path, (version, name) in self.discovered.items()
+                },
+            }
+            try:
+                tmp_path = self.path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(data), encoding="utf-8")
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+            except OSError as e:
+                logger.warning(f"Could not save skill cache: {e}")
+
+
 class SkillController:
     """
     Controlador que FUERZA ejecucion estructurada de skills.
@@ -104,26 +706,99 @@ class SkillController:
         self.schema_path = self.base_path / schema_path
         self.output_dir = self.base_path / output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Log paths are built by string concatenation from this prefix
+        self._output_prefix = os.fspath(self.output_dir) + os.sep
+
+        # Resolved once; _validate_path_safety runs for every step working_dir
+        self._base_resolved = os.path.realpath(self.base_path)
 
         # Load JSON Schema for validation
         # IMPORTANT: Load schema regardless of jsonschema availability
         # Validation will fail later if schema exists but jsonschema is not installed
         self.schema = None
         if self.schema_path.exists():
-            with open(self.schema_path) as f:
-                self.schema = json.load(f)
-            if not HAS_JSONSCHEMA:
+            self.schema = _json_loads(self.schema_path.read_bytes())
+            if not HAS_JSONSCHEMA and not HAS_FASTJSONSCHEMA:
                 logger.warning(
                     "Schema loaded but jsonschema not installed. "
                     "Validation will be enforced - install jsonschema or remove schema file."
                 )
 
-        # Load all skills into registry
-        self.registry: Dict[str, Dict] = {}
+        # Fast path: compiled validator, cached on disk between runs
+        self._fast_validate: Optional[Callable[[Any], Any]] = None
+        if self.schema and HAS_FASTJSONSCHEMA:
+            try:
+                # jsonschema re-validates failures for the readable error, so
+                # the generated fast path only needs a pass/fail answer.
+                self._fast_validate = load_compiled_validator(
+                    self.schema, detailed_exceptions=not HAS_JSONSCHEMA
+                )
+            except Exception as e:
+                logger.warning(f"Could not compile schema with fastjsonschema: {e}")
+
+        # jsonschema validator, built on first need (see _get_validator)
+        self._validator: Any = None
+        if self.schema and HAS_JSONSCHEMA and self._fast_validate is None:
+            self._get_validator()  # Only backend: check the schema up front
+
+        # Persistent record of skill files that already passed schema
+        # validation: {path: {mtime_ns, size, sha256}} for this schema version,
+        # plus the last discovery ({path: [mtime_ns, size, name]}) so a new
+        # process only has to stat skill files that haven't changed
+        schema_digest = (
+            hashlib.sha256(
+                json.dumps(self.schema, sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            if self.schema
+            else None
+        )
+        self._skill_cache = _SkillCacheFile(
+            self.output_dir / ".skill_cache.json", schema_digest
+        )
+        # Saved at exit or when the controller is collected, whichever comes
+        # first (the finalizer only references the cache, not the controller)
+        self._skill_cache_finalizer = weakref.finalize(self, self._skill_cache.save)
+
+        # Executable names on PATH, indexed by the first command_exists check
+        # and rebuilt once it is _PREREQ_TTL_S old (monotonic expiry time)
+        self._path_executables: Optional[frozenset] = None
+        self._path_executables_expires = 0.0
+
+        # Recent command_exists results: (check, args) -> (expires, result)
+        self._prereq_results: Dict[Tuple, Tuple[float, Tuple[bool, str]]] = {}
+
+        # Parsed + validated skills by path, reused while (mtime_ns, size)
+        # match. Kept across reload_registry() so only changed files re-parse.
+        self._parsed_skills: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+        # Required input names and enum sets by skill name, kept out of the
+        # skill dict (get_skill_info returns it): (skill, required, enums)
+        self._input_indexes: Dict[str, Tuple[Dict, frozenset, Dict[str, Any]]] = {}
+
+        # Discover skills; each one is parsed and validated on first use
+        self.registry: Dict[str, Dict] = {}  # Loaded skills
+        self._skill_paths: Dict[str, Path] = {}  # Discovered: name -> skill.json
+        self._skills_sorted: Optional[List[str]] = None  # list_skills() cache
+        # Discovery results: skill.json path -> ((mtime_ns, size), name)
+        self._discovered: Dict[str, Tuple[Tuple[int, int], str]] = {}
         self._load_registry()
 
-        logger.info(f"SkillController initialized with {len(self.registry)} skills")
-        logger.info(f"Skills directory: {self.skills_dir}")
+        # Memoized input checks for repeated (skill, inputs) pairs
+        self._check_inputs_cached = lru_cache(maxsize=512)(self._check_inputs_key)
+
+        # Step type -> handler (see _execute_step)
+        self._step_handlers: Dict[str, Callable[..., StepResult]] = {
+            "bash": self._step_bash,
+            "python": self._step_python,
+            "agent": self._step_agent,
+            "checkpoint": self._step_checkpoint,
+            "mcp": self._step_mcp,
+        }
+
+        logger.info(
+            "SkillController initialized with %s skills", len(self._skill_paths)
+        )
+        logger.info("Skills directory: %s", self.skills_dir)
 
     def _validate_path_safety(self, path_str: str, context: str = "path") -> Path:
         """
@@ -139,22 +814,29 @@ class SkillController:
         Raises:
             ValueError: If path attempts to escape workspace
         """
-        # Resolve the path
+        # Resolve the path (realpath follows symlinks out of the workspace)
         try:
-            resolved = Path(path_str).resolve()
+            resolved = os.path.realpath(path_str)
         except Exception as e:
             raise ValueError(f"Invalid {context}: {path_str} - {e}")
 
         # Check if it's within the workspace
         try:
-            resolved.relative_to(self.base_path.resolve())
+            inside = (
+                os.path.commonpath([resolved, self._base_resolved])
+                == self._base_resolved
+            )
         except ValueError:
+            # Different drives (Windows) or mixed absolute/relative paths
+            inside = False
+
+        if not inside:
             raise ValueError(
                 f"SECURITY: {context} '{path_str}' attempts to escape workspace. "
                 f"Must be within: {self.base_path}"
             )
 
-        return resolved
+        return Path(resolved)
 
     def _sanitize_inputs_for_log(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -162,36 +844,24 @@ class SkillController:
 
         Redacts values for keys that commonly contain secrets.
         """
-        SENSITIVE_KEYS = {
-            "password",
-            "secret",
-            "token",
-            "api_key",
-            "apikey",
-            "api-key",
-            "private_key",
-            "privatekey",
-            "auth",
-            "credential",
-            "credentials",
-            "access_key",
-            "secret_key",
-            "bearer",
-            "jwt",
-            "session",
-        }
-
-        sanitized = {}
-        for key, value in inputs.items():
-            key_lower = key.lower()
-            # Check if any sensitive keyword is in the key name
-            if any(sensitive in key_lower for sensitive in SENSITIVE_KEYS):
-                sanitized[key] = "[REDACTED]"
-            elif isinstance(value, dict):
-                # Recursively sanitize nested dicts
-                sanitized[key] = self._sanitize_inputs_for_log(value)
-            else:
-                sanitized[key] = value
+        if not inputs:
+            return inputs
+
+        sanitized: Dict[str, Any] = {}
+        # Walk nested dicts with an explicit stack of (source, destination)
+        stack = [(inputs, sanitized)]
+        while stack:
+            source, dest = stack.pop()
+            for key, value in source.items():
+                # Check if any sensitive keyword is in the key name (one regex pass)
+                if _SENSITIVE_KEY_RE.search(key.lower()):
+                    dest[key] = "[REDACTED]"
+                elif isinstance(value, dict):
+                    nested: Dict[str, Any] = {}
+                    dest[key] = nested
+                    stack.append((value, nested))
+                else:
+                    dest[key] = value
 
         return sanitized
 
@@ -288,128 +958,543 @@ class SkillController:
                             f"Skill {skill_path} has unsafe default value: {e}"
                         )
 
-    def _load_registry(self) -> None:
-        """Load all skills and validate against schema."""
-        if not self.skills_dir.exists():
-            logger.warning(f"Skills directory not found: {self.skills_dir}")
+    def _validate_schema(self, skill: Dict[str, Any]) -> None:
+        """
+        Validate a skill definition against the schema.
+
+        Uses the compiled fastjsonschema validator when available. On failure,
+        jsonschema (if installed) re-validates to raise its richer error.
+
+        Raises:
+            RuntimeError: If no validation backend is installed
+            jsonschema.ValidationError / fastjsonschema.JsonSchemaException
+        """
+        if self._fast_validate is not None:
+            try:
+                self._fast_validate(skill)
+                return
+            except fastjsonschema.JsonSchemaException:  # type: ignore[union-attr]
+                if not HAS_JSONSCHEMA:
+                    raise
+                # Fall through: jsonschema gives the more detailed report
+
+        if not HAS_JSONSCHEMA:
+            raise RuntimeError(
+                f"Schema validation required but jsonschema not installed. "
+                f"Run: pip install jsonschema"
+            )
+        self._get_validator().validate(skill)
+
+    def _get_validator(self) -> Any:
+        """
+        Return the jsonschema validator, importing jsonschema on first call.
+
+        Built once: jsonschema.validate() re-checks the schema and rebuilds a
+        validator on every call.
+        """
+        if self._validator is None:
+            validators = _import_jsonschema().validators
+            validator_cls = validators.validator_for(self.schema)
+            validator_cls.check_schema(self.schema)
+            self._validator = validator_cls(self.schema)
+        return self._validator
+
+    def _load_skill_file(
+        self,
+        skill_json: Path,
+        prefetched: Optional[Tuple[bytes, os.stat_result]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Parse and validate a single skill.json.
+
+        prefetched is (raw bytes, stat) when the file was already read by
+        _load_all's worker threads.
+        """
+        key = str(skill_json)
+        cached = self._parsed_skills.get(key)
+        if cached is not None:
+            st = prefetched[1] if prefetched else os.stat(skill_json)
+            if cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                return cached[2]
+
+        raw, st = prefetched or _read_skill_file(skill_json)
+        skill = _json_loads(raw)
+
+        # Validate against schema - ENFORCED if schema exists. Files that
+        # passed before (same content, same schema) skip the schema walk.
+        if self.schema and not self._is_cached_valid(skill_json, st, raw):
+            self._validate_schema(skill)
+            self._mark_cached_valid(skill_json, st, raw)
+
+        # Validate default values in skill.json are shell-safe
+        self._validate_skill_defaults(skill, skill_json)
+
+        # Every SkillResult/ExecutionLog of this skill shares these objects
+        skill["name"] = sys.intern(skill["name"])
+        skill["version"] = sys.intern(skill["version"])
+
+        self._precompile_templates(skill)
+        self._build_step_graph(skill)
+        self._index_inputs(skill)
+
+        self._parsed_skills[key] = (st.st_mtime_ns, st.st_size, skill)
+        return skill
+
+    def _load_skill_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Return the validation cache, reading it from disk on first use."""
+        cache_file = self._skill_cache
+        if cache_file.skills is None:
+            cache: Dict[str, Dict[str, Any]] = {}
+            try:
+                data = _json_loads(cache_file.path.read_bytes())
+                if data.get("schema") == cache_file.schema_digest:
+                    cache = data.get("skills", {})
+                    cache_file.saved_discovery = data.get("discovered", {})
+            except (OSError, ValueError, AttributeError):
+                pass  # Missing or unreadable cache: start empty
+            cache_file.skills = cache
+        return cache_file.skills
+
+    def _is_cached_valid(
+        self, skill_json: Path, st: os.stat_result, raw: bytes
+    ) -> bool:
+        """True if this exact skill.json already passed schema validation."""
+        if self._fast_validate is None and not HAS_JSONSCHEMA:
+            return False  # No backend: let _validate_schema enforce the error
+
+        with self._skill_cache.lock:
+            entry = self._load_skill_cache().get(str(skill_json))
+            if entry is None:
+                return False
+            if entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                return True
+            # Touched but maybe unchanged: fall back to the content hash
+            if entry["sha256"] == hashlib.sha256(raw).hexdigest():
+                entry["mtime_ns"] = st.st_mtime_ns
+                entry["size"] = st.st_size
+                self._skill_cache.dirty = True
+                return True
+            return False
+
+    def _mark_cached_valid(
+        self, skill_json: Path, st: os.stat_result, raw: bytes
+    ) -> None:
+        """Record that skill_json passed schema validation."""
+        with self._skill_cache.lock:
+            self._load_skill_cache()[str(skill_json)] = {
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "sha256": hashlib.sha256(raw).hexdigest(),
+            }
+            self._skill_cache.dirty = True
+
+    def _index_inputs(self, skill: Dict[str, Any]) -> Tuple[frozenset, Dict[str, Any]]:
+        """Precompute required input names and enum sets for validate_inputs."""
+        skill_inputs = skill.get("inputs", {})
+        required_inputs = frozenset(
+            name for name, spec in skill_inputs.items() if spec.get("required", False)
+        )
+        enum_inputs = {}
+        for name, spec in skill_inputs.items():
+            if "enum" in spec:
+                try:
+                    enum_inputs[name] = frozenset(spec["enum"])
+                except TypeError:
+                    # Unhashable enum values (lists/objects): keep the list
+                    enum_inputs[name] = spec["enum"]
+        self._input_indexes[skill.get("name")] = (skill, required_inputs, enum_inputs)
+        return required_inputs, enum_inputs
+
+    def _build_step_graph(self, skill: Dict[str, Any]) -> None:
+        """
+        Attach execution layers (_layers) for skills that use depends_on.
+
+        Layer N holds the steps whose dependencies all sit in layers < N, so
+        the steps of one layer can run concurrently.
+
+        Raises:
+            ValueError: If step ids repeat, a step depends on an unknown step
+                or steps form a cycle
+        """
+        steps = skill.get("steps", [])
+        if not any("depends_on" in step for step in steps):
             return
 
-        for skill_dir in self.skills_dir.iterdir():
-            if not skill_dir.is_dir():
-                continue
+        # Ids key the graph: a repeated id would silently merge two steps
+        successors: Dict[str, List[str]] = {}
+        for step in steps:
+            if step["id"] in successors:
+                raise ValueError(
+                    f"Skill '{skill['name']}' has duplicate step id '{step['id']}'"
+                )
+            successors[step["id"]] = []
+        indegree: Dict[str, int] = {}
+        for step in steps:
+            depends_on = step.get("depends_on", [])
+            for dep in depends_on:
+                if dep not in successors:
+                    raise ValueError(
+                        f"Step '{step['id']}' depends on unknown step '{dep}'"
+                    )
+                successors[dep].append(step["id"])
+            indegree[step["id"]] = len(depends_on)
+
+        # Kahn's algorithm, one layer at a time: every step lands one layer
+        # after its deepest dependency. Steps never reaching indegree 0 are
+        # in a cycle.
+        layers: List[List[str]] = []
+        layer = [step_id for step_id, count in indegree.items() if count == 0]
+        visited = 0
+        while layer:
+            layers.append(layer)
+            visited += len(layer)
+            next_layer = []
+            for step_id in layer:
+                for successor in successors[step_id]:
+                    indegree[successor] -= 1
+                    if indegree[successor] == 0:
+                        next_layer.append(successor)
+            layer = next_layer
+
+        if visited != len(steps):
+            raise ValueError(f"Skill '{skill['name']}' has a dependency cycle")
+
+        skill["_layers"] = layers
+
+    def _precompile_templates(self, skill: Dict[str, Any]) -> None:
+        """Parse cmd/path/working_dir templates once (execution only substitutes)."""
+        for entry in (
+            skill.get("steps", [])
+            + skill.get("rollback", [])
+            + skill.get("verification", [])
+        ):
+            if "cmd" in entry:
+                entry["_cmd_parsed"] = parse_template(entry["cmd"])
+            if "path" in entry:
+                entry["_path_parsed"] = parse_template(entry["path"])
+            if "working_dir" in entry:
+                entry["_working_dir_parsed"] = parse_template(entry["working_dir"])
+
+    def _load_registry(self) -> Set[str]:
+        """
+        Discover skills without parsing them.
 
-            skill_json = skill_dir / "skill.json"
-            if not skill_json.exists():
-                continue
+        Only the skill name is read from the start of each skill.json; the
+        full parse + schema validation happens on first use (_ensure_loaded).
+        Files whose (mtime_ns, size) match the previous discovery (in this
+        process, or saved by the last one) reuse the name found then instead
+        of being read again.
 
+        Returns:
+            Paths of skill.json files that are new or changed since then
+        """
+        self._skills_sorted = None
+        if not self.skills_dir.exists():
+            logger.warning(f"Skills directory not found: {self.skills_dir}")
+            self._discovered.clear()
+            return set()
+
+        # scandir: is_dir() comes from the directory entry (no stat call)
+        found: List[Tuple[Path, Tuple[int, int]]] = []
+        with os.scandir(self.skills_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                try:
+                    st = os.stat(entry.path + "/skill.json")
+                except OSError:
+                    continue  # No skill.json in this directory
+                found.append(
+                    (Path(entry.path, "skill.json"), (st.st_mtime_ns, st.st_size))
+                )
+
+        previous = self._discovered
+        if not previous:
+            previous = self._load_cached_discovery()
+        self._discovered = {}  # Rebuilt: vanished files drop out
+        names: Dict[Path, Optional[str]] = {}
+        changed: List[Path] = []
+        for skill_json, version in found:
+            known = previous.get(str(skill_json))
+            if known is not None and known[0] == version:
+                names[skill_json] = known[1]
+            else:
+                changed.append(skill_json)
+
+        # Peeking is I/O bound: overlap file reads across threads, then
+        # register results in directory order on this thread
+        if changed:
+            max_workers = min(32, (os.cpu_count() or 1) * 4, len(changed))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                names.update(zip(changed, executor.map(_peek_skill_name, changed)))
+
+        for skill_json, version in found:
+            name = names[skill_json]
+            if name is None:
+                # No "name" near the top of the file: load it fully right away
+                skill = self._load_skill(skill_json)
+                if skill is None:
+                    continue
+                name = skill["name"]
+            self._skill_paths[name] = skill_json
+            self._discovered[str(skill_json)] = (version, name)
+
+        with self._skill_cache.lock:
+            self._skill_cache.discovered = self._discovered
+            if self._discovered != previous:
+                self._skill_cache.dirty = True
+
+        return {str(skill_json) for skill_json in changed}
+
+    def _load_cached_discovery(self) -> Dict[str, Tuple[Tuple[int, int], str]]:
+        """Discovery results saved by the last process (see _SkillCacheFile)."""
+        with self._skill_cache.lock:
+            self._load_skill_cache()
+            saved = self._skill_cache.saved_discovery
             try:
-                with open(skill_json, encoding="utf-8") as f:
-                    skill = json.load(f)
-
-                # Validate against schema - ENFORCED if schema exists
-                if self.schema:
-                    if not HAS_JSONSCHEMA:
-                        raise RuntimeError(
-                            f"Schema validation required but jsonschema not installed. "
-                            f"Run: pip install jsonschema"
-                        )
-                    jsonschema.validate(instance=skill, schema=self.schema)  # type: ignore[union-attr]
+                return {
+                    path: ((mtime_ns, size), name)
+                    for path, (mtime_ns, size, name) in saved.items()
+                }
+            except (TypeError, ValueError):
+                return {}  # Malformed: peek every file again
+
+    def _load_skill(
+        self,
+        skill_json: Path,
+        prefetched: Optional[Tuple[bytes, os.stat_result]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Parse, validate and register one skill. Returns None on failure."""
+        try:
+            skill = self._load_skill_file(skill_json, prefetched)
 
-                # Validate default values in skill.json are shell-safe
-                self._validate_skill_defaults(skill, skill_json)
+            self.registry[skill["name"]] = skill
+            self.registry[skill["name"]]["_path"] = str(skill_json.parent)
+            logger.info("  Loaded skill: %s v%s", skill["name"], skill["version"])
+            return skill
 
-                self.registry[skill["name"]] = skill
-                self.registry[skill["name"]]["_path"] = str(skill_dir)
-                logger.info(f"  Loaded skill: {skill['name']} v{skill['version']}")
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON in {skill_json}: {e}")
+        except RuntimeError as e:
+            # Schema validation required but jsonschema not installed
+            logger.error(str(e))
+        except Exception as e:
+            # Check if it's a jsonschema validation error
+            # (jsonschema is only imported once it has validated something)
+            if jsonschema is not None:
+                if isinstance(e, jsonschema.ValidationError):
+                    logger.error(f"Skill {skill_json} failed validation: {e.message}")
+                    return None
+            if HAS_FASTJSONSCHEMA and fastjsonschema is not None:
+                if isinstance(e, fastjsonschema.JsonSchemaException):
+                    logger.error(f"Skill {skill_json} failed validation: {e.message}")
+                    return None
+            logger.error(f"Failed to load {skill_json}: {e}")
+        return None
+
+    def _ensure_loaded(
+        self,
+        skill_name: str,
+        prefetched: Optional[Tuple[bytes, os.stat_result]] = None,
+    ) -> Optional[Dict]:
+        """
+        Return the fully loaded skill, parsing and validating it on first use.
 
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON in {skill_json}: {e}")
-            except RuntimeError as e:
-                # Schema validation required but jsonschema not installed
-                logger.error(str(e))
-            except Exception as e:
-                # Check if it's a jsonschema validation error
-                if HAS_JSONSCHEMA and jsonschema is not None:
-                    if isinstance(e, jsonschema.ValidationError):
-                        logger.error(
-                            f"Skill {skill_json} failed validation: {e.message}"
-                        )
-                        continue
-                logger.error(f"Failed to load {skill_json}: {e}")
+        Skills that fail to load are dropped from the registry so they are no
+        longer listed.
+        """
+        skill = self.registry.get(skill_name)
+        if skill is not None:
+            return skill
+
+        skill_json = self._skill_paths.get(skill_name)
+        if skill_json is None:
+            return None
+
+        skill = self._load_skill(skill_json, prefetched)
+        if skill is None:
+            del self._skill_paths[skill_name]
+            self._skills_sorted = None
+            return None
+
+        if skill["name"] != skill_name:
+            # The peeked "name" belonged to a nested object: re-key the entry
+            del self._skill_paths[skill_name]
+            self._skill_paths[skill["name"]] = skill_json
+            self._skills_sorted = None
+            return None
+
+        return skill
+
+    def _load_all(self) -> None:
+        """
+        Load every discovered skill that isn't loaded yet.
+
+        File reads overlap in worker threads; parsing, validation and registry
+        updates stay on this thread (validators aren't guaranteed thread-safe).
+        """
+        pending = [
+            (name, path)
+            for name, path in self._skill_paths.items()
+            if name not in self.registry
+        ]
+        prefetched: Dict[str, Optional[Tuple[bytes, os.stat_result]]] = {}
+        if len(pending) > 1:
+
+            def read(path: Path) -> Optional[Tuple[bytes, os.stat_result]]:
+                try:
+                    return _read_skill_file(path)
+                except OSError:
+                    return None  # Reported when loaded on this thread
+
+            max_workers = min(32, (os.cpu_count() or 1) * 4, len(pending))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(read, [path for _, path in pending])
+                prefetched = dict(zip((name for name, _ in pending), results))
+
+        for name, _ in pending:
+            self._ensure_loaded(name, prefetched.get(name))
 
     def reload_registry(self) -> None:
-        """Reload all skills from disk."""
-        self.registry.clear()
-        self._load_registry()
-        logger.info(f"Registry reloaded: {len(self.registry)} skills")
+        """
+        Reload skills from disk.
+
+        Only new or modified skill.json files are read again; loaded skills
+        whose file is unchanged stay loaded, and removed skills are dropped.
+        """
+        old_paths = dict(self._skill_paths)
+        self._skill_paths.clear()
+        self._check_inputs_cached.cache_clear()
+        self._path_executables = None
+        self._prereq_results.clear()
+        _which_found.clear()
+        changed = self._load_registry()
+
+        for name in list(self.registry):
+            path = self._skill_paths.get(name)
+            if path is None or path != old_paths.get(name) or str(path) in changed:
+                del self.registry[name]
+
+        # Parsed copies of files that no longer exist can't be used again
+        for key in list(self._parsed_skills):
+            if key not in self._discovered:
+                del self._parsed_skills[key]
+
+        logger.info("Registry reloaded: %s skills", len(self._skill_paths))
 
     def list_skills(self) -> List[str]:
         """Return list of available skills (prevents hallucinations)."""
-        return sorted(self.registry.keys())
+        # Sorted once per registry change; callers get their own copy
+        if self._skills_sorted is None:
+            self._skills_sorted = sorted(self._skill_paths)
+        return list(self._skills_sorted)
+
+    def list_skills_with_info(self) -> List[Dict[str, str]]:
+        """
+        Return name, version and a short description for every loadable skill.
+
+        One pass over the registry (for --list); descriptions are cut to 50
+        characters so the summaries don't keep long strings alive.
+        """
+        self._load_all()
+        summaries = []
+        for skill_name in self.list_skills():
+            info = self._ensure_loaded(skill_name)
+            if info:
+                summaries.append(
+                    {
+                        "name": skill_name,
+                        "version": info["version"],
+                        "description": info.get("description", "No description")[:50],
+                    }
+                )
+        return summaries
 
     def get_skill_info(self, skill_name: str) -> Optional[Dict]:
         """Get detailed info about a skill."""
-        return self.registry.get(skill_name)
+        return self._ensure_loaded(skill_name)
 
     def validate_skill_exists(self, skill_name: str) -> bool:
         """
         CRITICAL: Validate skill exists before execution.
         Prevents agent from hallucinating non-existent skills.
+
+        The skill is loaded and schema-validated here if it wasn't already.
         """
-        exists = skill_name in self.registry
+        exists = self._ensure_loaded(skill_name) is not None
 
         if not exists:
             logger.error(f"SKILL NOT FOUND: '{skill_name}'")
-            logger.info(f"Available skills: {self.list_skills()}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Available skills: %s", self.list_skills())
 
         return exists
 
     def validate_inputs(self, skill: Dict, inputs: Dict) -> tuple[bool, Optional[str]]:
         """Validate inputs match skill requirements including type checking."""
-        skill_inputs = skill.get("inputs", {})
+        skill_name = skill.get("name")
+        if self.registry.get(skill_name) is skill:
+            try:
+                # type() is part of the key: 1 == True but they validate differently
+                key = frozenset(
+                    (name, type(value), value) for name, value in inputs.items()
+                )
+            except TypeError:
+                pass  # Unhashable input values: validate directly
+            else:
+                return self._check_inputs_cached(skill_name, key)
 
-        # Type mapping for validation
-        TYPE_MAP = {
-            "string": str,
-            "str": str,
-            "integer": int,
-            "int": int,
-            "number": (int, float),
-            "float": float,
-            "boolean": bool,
-            "bool": bool,
-            "array": list,
-            "list": list,
-            "object": dict,
-            "dict": dict,
-        }
+        return self._check_inputs(skill, inputs)
+
+    def _check_inputs_key(
+        self, skill_name: str, key: frozenset
+    ) -> tuple[bool, Optional[str]]:
+        """lru_cache target: rebuild the inputs from the hashable key."""
+        inputs = {name: value for name, _, value in key}
+        return self._check_inputs(self.registry[skill_name], inputs)
+
+    def _check_inputs(self, skill: Dict, inputs: Dict) -> tuple[bool, Optional[str]]:
+        """Run the required/enum/type checks for validate_inputs."""
+        skill_inputs = skill.get("inputs", {})
+        index = self._input_indexes.get(skill.get("name"))
+        if index is not None and index[0] is skill:
+            _, required_inputs, enum_inputs = index
+        else:
+            # Not loaded by this controller (or reloaded since): index it now
+            required_inputs, enum_inputs = self._index_inputs(skill)
 
         for input_name, input_spec in skill_inputs.items():
             # Check required inputs
-            if input_spec.get("required", False) and input_name not in inputs:
-                return False, f"Missing required input: {input_name}"
+            if input_name not in inputs:
+                if input_name in required_inputs:
+                    return False, f"Missing required input: {input_name}"
+                continue
+
+            actual_value = inputs[input_name]
 
             # Validate enum values
-            if input_name in inputs and "enum" in input_spec:
-                if inputs[input_name] not in input_spec["enum"]:
+            allowed = enum_inputs.get(input_name)
+            if allowed is not None:
+                try:
+                    is_allowed = actual_value in allowed
+                except TypeError:
+                    # Unhashable value against a frozenset of enum values
+                    is_allowed = actual_value in input_spec["enum"]
+                if not is_allowed:
                     return (
                         False,
                         f"Invalid value for {input_name}: must be one of {input_spec['enum']}",
                     )
 
             # Validate types
-            if input_name in inputs and "type" in input_spec:
-                expected_type = input_spec["type"]
-                actual_value = inputs[input_name]
-
-                if expected_type in TYPE_MAP:
-                    expected_python_type = TYPE_MAP[expected_type]
-                    if not isinstance(actual_value, expected_python_type):
-                        return (
-                            False,
-                            f"Invalid type for {input_name}: expected {expected_type}, "
-                            f"got {type(actual_value).__name__}",
-                        )
+            expected_type = input_spec.get("type")
+            if expected_type in _INPUT_TYPES:
+                if not isinstance(actual_value, _INPUT_TYPES[expected_type]):
+                    return (
+                        False,
+                        f"Invalid type for {input_name}: expected {expected_type}, "
+                        f"got {type(actual_value).__name__}",
+                    )
 
         return True, None
 
@@ -432,7 +1517,8 @@ class SkillController:
         Returns:
             SkillResult with success status and logs
         """
-        start_time = datetime.now()
+        start_time = datetime.now()  # Wall clock: log timestamp only
+        start_ns = time.perf_counter_ns()
 
         # ENFORCEMENT 1: Skill MUST exist
         if not self.validate_skill_exists(skill_name):
@@ -444,10 +1530,10 @@ class SkillController:
             )
 
         skill = self.registry[skill_name]
-        logger.info(f"\n{'=' * 60}")
-        logger.info(f"EXECUTING SKILL: {skill_name} v{skill['version']}")
-        logger.info(f"Autonomy Level: {skill['autonomy']}")
-        logger.info(f"{'=' * 60}")
+        logger.info("\n" + "=" * 60)
+        logger.info("EXECUTING SKILL: %s v%s", skill_name, skill["version"])
+        logger.info("Autonomy Level: %s", skill["autonomy"])
+        logger.info("=" * 60)
 
         # Validate inputs (required fields, enum values, types)
         valid, error = self.validate_inputs(skill, inputs)
@@ -477,46 +1563,55 @@ class SkillController:
 
         steps_completed = []
         steps_failed = []
-        execution_log = {
-            "timestamp": start_time.isoformat(),
-            "skill": skill_name,
-            "version": skill["version"],
-            "autonomy": skill["autonomy"],
-            "inputs": self._sanitize_inputs_for_log(
-                inputs
-            ),  # SECURITY: Sanitize secrets
-            "dry_run": dry_run,
-            "steps": [],
-        }
+        execution_log = ExecutionLog(
+            timestamp=start_time.isoformat(),
+            skill=skill_name,
+            version=skill["version"],
+            autonomy=skill["autonomy"],
+            inputs=self._sanitize_inputs_for_log(inputs),  # SECURITY: Sanitize secrets
+            dry_run=dry_run,
+        )
+        # Save log (dry runs change nothing: no log file)
+        if not dry_run:
+            timestamp = start_time.strftime("%Y%m%d_%H%M%S")
+            try:
+                execution_log.log_file = _create_log_file(
+                    f"{self._output_prefix}{skill_name}_{timestamp}"
+                )
+            except OSError as e:
+                logger.error(f"Could not create log for {skill_name}: {e}")
+            self._write_log_record(execution_log, execution_log.header())
 
         try:
             # ENFORCEMENT 2: Pre-requisites MUST pass
             logger.info("\n[1/4] Checking pre-requisites...")
+            prereq_memo: Dict[Tuple, Tuple[bool, str]] = {}  # Repeats in this run
             for prereq in skill.get("pre_requisites", []):
-                passed, msg = self._check_prereq(prereq)
+                passed, msg = self._check_prereq_memo(prereq, prereq_memo)
                 if not passed:
                     error_msg = prereq.get(
                         "error_message", f"Pre-requisite failed: {prereq}"
                     )
                     logger.error(f"  FAILED: {error_msg}")
-                    execution_log["error"] = error_msg
+                    execution_log.error = error_msg
                     return self._finalize_result(
                         skill,
                         steps_completed,
                         steps_failed,
                         execution_log,
                         start_time,
+                        start_ns,
                         success=False,
                         error=error_msg,
                     )
-                logger.info(f"  PASSED: {prereq['check']} {prereq['args']}")
+                logger.info("  PASSED: %s %s", prereq["check"], prereq["args"])
 
             # ENFORCEMENT 3: Context7 MUST be loaded if required
             context7_libs = skill.get("context7_required", [])
             if context7_libs:
-                logger.info(f"\n[2/4] Loading Context7 libraries...")
+                logger.info("\n[2/4] Loading Context7 libraries...")
                 for lib in context7_libs:
-                    logger.info(f"  Loading: {lib}")
+                    logger.info("  Loading: %s", lib)
                 if agent_callback and not dry_run:
                     try:
                         agent_callback("use_context7", libs=context7_libs)
@@ -534,91 +1629,72 @@ class SkillController:
                     steps_completed=["(dry run)"],
                 )
 
-            # ENFORCEMENT 4: Execute steps SEQUENTIALLY (cannot skip)
-            logger.info(f"\n[3/4] Executing {len(skill['steps'])} steps...")
-            total_steps = len(skill["steps"])
-
-            for i, step in enumerate(skill["steps"], 1):
-                step_id = step["id"]
-                logger.info(f"\n  Step {i}/{total_steps}: {step_id}")
-                logger.info(f"  Type: {step['type']}")
-
-                result = self._execute_step(step, inputs, agent_callback, skill)
-
-                execution_log["steps"].append(
-                    {
-                        "id": step_id,
-                        "type": step["type"],
-                        "status": "success" if result.success else "failed",
-                        "duration_ms": result.duration_ms,
-                        "output": result.output[:1000] if result.output else "",
-                        "error": result.error,
-                        "retries_used": result.retries_used,
-                    }
+            # ENFORCEMENT 4: Execute steps in order (cannot skip)
+            # Sequential by default; by dependency when steps declare depends_on
+            logger.info("\n[3/4] Executing %s steps...", len(skill["steps"]))
+            if "_layers" in skill:
+                failure = self._execute_steps_parallel(
+                    skill, inputs, agent_callback, execution_log, steps_completed
+                )
+            else:
+                failure = self._execute_steps_sequential(
+                    skill, inputs, agent_callback, execution_log, steps_completed
                 )
 
-                if not result.success:
-                    logger.error(f"  FAILED: {result.error}")
-
-                    # RETRY if configured
-                    retries = step.get("retry", 0)
-                    for attempt in range(retries):
-                        logger.info(f"  Retry {attempt + 1}/{retries}...")
-                        result = self._execute_step(step, inputs, agent_callback, skill)
-                        if result.success:
-                            logger.info(f"  Retry succeeded")
-                            result.retries_used = attempt + 1
-                            break
-
-                    if not result.success:
-                        steps_failed.append(step_id)
-
-                        # ROLLBACK automatically
-                        if skill.get("rollback"):
-                            self._rollback(skill, steps_completed, inputs)
-
-                        error_msg = f"Step '{step_id}' failed: {result.error}"
-                        execution_log["error"] = error_msg
-                        return self._finalize_result(
-                            skill,
-                            steps_completed,
-                            steps_failed,
-                            execution_log,
-                            start_time,
-                            success=False,
-                            error=error_msg,
-                        )
-
-                steps_completed.append(step_id)
-                logger.info(f"  SUCCESS ({result.duration_ms}ms)")
+            if failure:
+                step_id, result = failure
+                steps_failed.append(step_id)
+
+                # ROLLBACK automatically
+                if skill.get("rollback"):
+                    self._rollback(skill, set(steps_completed), inputs)
+
+                error_msg = f"Step '{step_id}' failed: {result.error}"
+                execution_log.error = error_msg
+                return self._finalize_result(
+                    skill,
+                    steps_completed,
+                    steps_failed,
+                    execution_log,
+                    start_time,
+                    start_ns,
+                    success=False,
+                    error=error_msg,
+                )
 
             # ENFORCEMENT 5: Verification MUST pass
             logger.info(
-                f"\n[4/4] Running {len(skill['verification'])} verification checks..."
+                "\n[4/4] Running %s verification checks...",
+                len(skill["verification"]),
             )
-            for i, check in enumerate(skill.get("verification", []), 1):
-                passed, msg = self._verify(check, inputs)
+            checks = skill.get("verification", [])
+            if skill.get("parallel_verification") and len(checks) > 1:
+                outcomes = self._verify_parallel(checks, inputs)
+            else:
+                outcomes = (self._verify(check, inputs) for check in checks)
+            for i, (check, (passed, msg)) in enumerate(zip(checks, outcomes), 1):
                 if not passed:
                     error_msg = check.get(
                         "error_message", f"Verification failed: {msg}"
                     )
                     logger.error(f"  Check {i}: FAILED - {error_msg}")
-                    execution_log["verification_failed"] = check
+                    execution_log.verification_failed = check
                     return self._finalize_result(
                         skill,
                         steps_completed,
                         steps_failed,
                         execution_log,
                         start_time,
+                        start_ns,
                         success=False,
                         error=error_msg,
                     )
-                logger.info(f"  Check {i}: PASSED")
+                logger.info("  Check %s: PASSED", i)
 
-            logger.info(f"\n{'=' * 60}")
-            logger.info(f"SKILL COMPLETED: {skill_name}")
-            logger.info(f"{'=' * 60}")
-            execution_log["verification"] = {"status": "passed"}
+            logger.info("\n" + "=" * 60)
+            logger.info("SKILL COMPLETED: %s", skill_name)
+            logger.info("=" * 60)
+            execution_log.verification = {"status": "passed"}
 
             return self._finalize_result(
                 skill,
@@ -626,278 +1702,619 @@ class SkillController:
                 steps_failed,
                 execution_log,
                 start_time,
+                start_ns,
                 success=True,
             )
 
         except KeyboardInterrupt:
             logger.warning("\nExecution interrupted by user")
-            execution_log["error"] = "Interrupted by user"
+            execution_log.error = "Interrupted by user"
             return self._finalize_result(
                 skill,
                 steps_completed,
                 steps_failed,
                 execution_log,
                 start_time,
+                start_ns,
                 success=False,
                 error="Interrupted by user",
             )
 
         except Exception as e:
             logger.exception(f"Unexpected error executing skill {skill_name}")
-            execution_log["error"] = str(e)
+            execution_log.error = str(e)
             return self._finalize_result(
                 skill,
                 steps_completed,
                 steps_failed,
                 execution_log,
                 start_time,
+                start_ns,
                 success=False,
                 error=str(e),
             )
 
-    def _execute_step(
-        self, step: Dict, inputs: Dict, agent_callback: Optional[Callable], skill: Dict
-    ) -> StepResult:
-        """Execute a single step."""
-        step_start = datetime.now()
-        step_type = step["type"]
-        step_id = step["id"]
+    def _execute_steps_sequential(
+        self,
+        skill: Dict,
+        inputs: Dict,
+        agent_callback: Optional[Callable],
+        execution_log: ExecutionLog,
+        steps_completed: List[str],
+    ) -> Optional[Tuple[str, StepResult]]:
+        """
+        Execute steps one after another in declaration order.
 
-        try:
-            if step_type == "bash":
-                # Format command with inputs
-                cmd = step["cmd"]
-                try:
-                    cmd = cmd.format(**inputs)
-                except KeyError as e:
-                    return StepResult(
-                        step_id=step_id,
-                        success=False,
-                        output="",
-                        duration_ms=0,
-                        error=f"Missing input for command: {e}",
-                    )
+        Returns:
+            (step_id, result) of the failed step, or None if all succeeded
+        """
+        total_steps = len(skill["steps"])
 
-                # Determine working directory with path traversal protection
-                working_dir_str = step.get("working_dir", ".")
-                working_dir = None
-                if working_dir_str != ".":
-                    try:
-                        working_dir_str = working_dir_str.format(**inputs)
-                        working_dir = self._validate_path_safety(
-                            working_dir_str, "working_dir"
-                        )
-                    except ValueError as e:
-                        return StepResult(
-                            step_id=step_id,
-                            success=False,
-                            output="",
-                            duration_ms=0,
-                            error=str(e),
-                        )
+        for i, step in enumerate(skill["steps"], 1):
+            step_id = step["id"]
+            logger.info("\n  Step %s/%s: %s", i, total_steps, step_id)
+            logger.info("  Type: %s", step["type"])
 
-                # Execute command (use shell=True for string commands with pipes/redirects)
-                # SECURITY: Commands come from trusted skill.json files, not user input
-                result = subprocess.run(
-                    cmd,
-                    shell=True,  # Required for string commands with shell features
-                    capture_output=True,
-                    text=True,
-                    timeout=step.get("timeout", 300),
-                    cwd=working_dir,
-                    env={**os.environ, **step.get("env", {})},
-                )
+            first_result, result = self._run_step(step, inputs, agent_callback, skill)
+            self._log_step(execution_log, step, first_result)
 
-                duration = int((datetime.now() - step_start).total_seconds() * 1000)
+            if not result.success:
+                return step_id, result
 
-                return StepResult(
-                    step_id=step_id,
-                    success=result.returncode == 0,
-                    output=result.stdout,
-                    duration_ms=duration,
-                    error=result.stderr if result.returncode != 0 else None,
-                )
+            steps_completed.append(step_id)
+            logger.info("  SUCCESS (%sms)", result.duration_ms)
 
-            elif step_type == "python":
-                # Execute Python code via subprocess (sandboxed)
-                # SECURITY: Never use exec() - always subprocess for isolation
-                code = step["cmd"]
-                try:
-                    code = code.format(**inputs)
-                except KeyError as e:
-                    return StepResult(
-                        step_id=step_id,
-                        success=False,
-                        output="",
-                        duration_ms=0,
-                        error=f"Missing input for code: {e}",
-                    )
+        return None
 
-                # Validate working directory with path traversal protection
-                python_working_dir = None
-                python_working_dir_str = step.get("working_dir", ".")
-                if python_working_dir_str != ".":
-                    try:
-                        python_working_dir_str = python_working_dir_str.format(**inputs)
-                        python_working_dir = self._validate_path_safety(
-                            python_working_dir_str, "python working_dir"
+    def _execute_steps_parallel(
+        self,
+        skill: Dict,
+        inputs: Dict,
+        agent_callback: Optional[Callable],
+        execution_log: ExecutionLog,
+        steps_completed: List[str],
+    ) -> Optional[Tuple[str, StepResult]]:
+        """
+        Execute steps layer by layer (see _build_step_graph).
+
+        The steps of a layer run concurrently and the next layer starts once
+        all of them have finished. After a failure no further layer starts.
+
+        Returns:
+            (step_id, result) of the first failed step, or None if all succeeded
+        """
+        layers = skill["_layers"]
+        steps_by_id = {step["id"]: step for step in skill["steps"]}
+        max_workers = min(32, max(len(layer) for layer in layers))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i, layer in enumerate(layers, 1):
+                logger.info("\n  Layer %s/%s: %s", i, len(layers), ", ".join(layer))
+
+                if len(layer) == 1:
+                    # Nothing to overlap: run inline instead of via the pool
+                    results = [
+                        self._run_step(
+                            steps_by_id[layer[0]], inputs, agent_callback, skill
                         )
-                    except ValueError as e:
-                        return StepResult(
-                            step_id=step_id,
-                            success=False,
-                            output="",
-                            duration_ms=0,
-                            error=str(e),
+                    ]
+                else:
+                    futures = [
+                        executor.submit(
+                            self._run_step,
+                            steps_by_id[step_id],
+                            inputs,
+                            agent_callback,
+                            skill,
                         )
+                        for step_id in layer
+                    ]
+                    wait(futures)
+                    results = [future.result() for future in futures]
+
+                # Record in declaration order so logs are deterministic
+                failure: Optional[Tuple[str, StepResult]] = None
+                for step_id, (first_result, result) in zip(layer, results):
+                    self._log_step(execution_log, steps_by_id[step_id], first_result)
+                    if not result.success:
+                        if failure is None:
+                            failure = (step_id, result)
+                        continue
+                    steps_completed.append(step_id)
+                    logger.info(
+                        "  Step %s: SUCCESS (%sms)", step_id, result.duration_ms
+                    )
 
-                # Execute via subprocess for security isolation
-                result = subprocess.run(
-                    [sys.executable, "-c", code],
-                    capture_output=True,
-                    text=True,
-                    timeout=step.get("timeout", 300),
-                    cwd=python_working_dir,
-                    env={**os.environ, **step.get("env", {})},
-                )
+                if failure is not None:
+                    return failure
+
+        return None
+
+    def _run_step(
+        self, step: Dict, inputs: Dict, agent_callback: Optional[Callable], skill: Dict
+    ) -> Tuple[StepResult, StepResult]:
+        """
+        Execute a step, retrying on failure if configured.
+
+        Returns:
+            (first attempt result, final result)
+        """
+        first_result = result = self._execute_step(step, inputs, agent_callback, skill)
+
+        if not result.success:
+            logger.error(f"  FAILED: {result.error}")
+
+            # RETRY if configured
+            retries = step.get("retry", 0)
+            for attempt in range(retries):
+                logger.info("  Retry %s/%s...", attempt + 1, retries)
+                result = self._execute_step(step, inputs, agent_callback, skill)
+                if result.success:
+                    logger.info("  Retry succeeded")
+                    result.retries_used = attempt + 1
+                    break
+
+        return first_result, result
+
+    def _log_step(
+        self, execution_log: ExecutionLog, step: Dict, result: StepResult
+    ) -> None:
+        """Write a step result to the execution log."""
+        self._write_log_record(
+            execution_log,
+            {
+                "_type": "step",
+                "id": step["id"],
+                "type": step["type"],
+                "status": "success" if result.success else "failed",
+                "duration_ms": result.duration_ms,
+                # No-op (same object) for output already clipped at capture;
+                # only StepResults returned by an agent callback may be longer
+                "output": result.output[:_STEP_OUTPUT_CHARS] if result.output else "",
+                "error": result.error,
+                "retries_used": result.retries_used,
+            },
+        )
+
+    def _execute_step(
+        self, step: Dict, inputs: Dict, agent_callback: Optional[Callable], skill: Dict
+    ) -> StepResult:
+        """Execute a single step."""
+        step_start = time.perf_counter_ns()
+        step_type = step["type"]
+        step_id = step["id"]
 
-                duration = int((datetime.now() - step_start).total_seconds() * 1000)
+        try:
+            handler = self._step_handlers.get(step_type)
+            if handler is None:
                 return StepResult(
                     step_id=step_id,
-                    success=result.returncode == 0,
-                    output=result.stdout if result.stdout else "OK",
-                    duration_ms=duration,
-                    error=result.stderr if result.returncode != 0 else None,
+                    success=False,
+                    output="",
+                    duration_ms=0,
+                    error=f"Unknown step type: {step_type}",
                 )
+            return handler(step, inputs, agent_callback, skill, step_start)
 
-            elif step_type == "agent":
-                # Delegate to agent callback
-                if not agent_callback:
-                    return StepResult(
-                        step_id=step_id,
-                        success=False,
-                        output="",
-                        duration_ms=0,
-                        error="No agent_callback provided for agent step",
-                    )
+        except subprocess.TimeoutExpired:
+            duration = (time.perf_counter_ns() - step_start) // 1_000_000
+            return StepResult(
+                step_id=step_id,
+                success=False,
+                output="",
+                duration_ms=duration,
+                error=f"Command timed out after {step.get('timeout', 300)}s",
+            )
+        except Exception as e:
+            duration = (time.perf_counter_ns() - step_start) // 1_000_000
+            return StepResult(
+                step_id=step_id,
+                success=False,
+                output="",
+                duration_ms=duration,
+                error=str(e),
+            )
 
-                result = agent_callback("execute_step", step=step, inputs=inputs)
-                duration = int((datetime.now() - step_start).total_seconds() * 1000)
+    def _step_bash(
+        self,
+        step: Dict,
+        inputs: Dict,
+        agent_callback: Optional[Callable],
+        skill: Dict,
+        step_start: int,
+    ) -> StepResult:
+        """Run a bash step: simple commands are exec'd directly."""
+        step_id = step["id"]
+        # Format command with inputs
+        try:
+            cmd = render_template(step["cmd"], step.get("_cmd_parsed"), inputs)
+        except KeyError as e:
+            return StepResult(
+                step_id=step_id,
+                success=False,
+                output="",
+                duration_ms=0,
+                error=f"Missing input for command: {e}",
+            )
 
-                if isinstance(result, StepResult):
-                    return result
+        # Determine working directory with path traversal protection
+        working_dir_str = step.get("working_dir", ".")
+        working_dir = None
+        if working_dir_str != ".":
+            try:
+                working_dir_str = render_template(
+                    working_dir_str, step.get("_working_dir_parsed"), inputs
+                )
+                working_dir = self._validate_path_safety(working_dir_str, "working_dir")
+            except ValueError as e:
                 return StepResult(
                     step_id=step_id,
-                    success=True,
-                    output=str(result) if result else "OK",
-                    duration_ms=duration,
-                )
-
-            elif step_type == "checkpoint":
-                # Human-in-the-loop
-                message = step.get(
-                    "checkpoint_message", step.get("description", "Continue?")
+                    success=False,
+                    output="",
+                    duration_ms=0,
+                    error=str(e),
                 )
-                logger.info(f"\n  CHECKPOINT: {message}")
 
-                if agent_callback:
-                    result = agent_callback("checkpoint", message=message)
-                    duration = int((datetime.now() - step_start).total_seconds() * 1000)
+        # Simple commands are exec'd directly; anything using shell
+        # features (pipes/redirects/expansion) goes through /bin/sh.
+        # A step-level PATH would change lookup: leave it to the shell.
+        # SECURITY: Commands come from trusted skill.json files, not user input
+        argv = None
+        if "PATH" not in step.get("env", {}):
+            argv = _split_simple_command(cmd)
+        result = self._run_streaming(
+            cmd if argv is None else argv,
+            step_id,
+            shell=argv is None,
+            timeout=step.get("timeout", 300),
+            cwd=working_dir,
+            env=self._step_env(step),
+        )
 
-                    if isinstance(result, StepResult):
-                        return result
+        duration = (time.perf_counter_ns() - step_start) // 1_000_000
 
-                    # Assume True means continue
-                    return StepResult(
-                        step_id=step_id,
-                        success=bool(result) if result is not None else True,
-                        output="Checkpoint passed",
-                        duration_ms=duration,
-                    )
-                else:
-                    # Auto-pass in non-interactive mode
-                    return StepResult(
-                        step_id=step_id,
-                        success=True,
-                        output="Auto-passed (no callback)",
-                        duration_ms=0,
-                    )
-
-            elif step_type == "mcp":
-                # MCP tool call
-                if not agent_callback:
-                    return StepResult(
-                        step_id=step_id,
-                        success=False,
-                        output="",
-                        duration_ms=0,
-                        error="No agent_callback provided for MCP step",
-                    )
+        return StepResult(
+            step_id=step_id,
+            success=result.returncode == 0,
+            output=result.stdout[-_STEP_OUTPUT_CHARS:],
+            duration_ms=duration,
+            error=result.stderr if result.returncode != 0 else None,
+        )
 
-                try:
-                    result = agent_callback(
-                        "mcp_call",
-                        server=step.get("mcp_server"),
-                        tool=step.get("mcp_tool"),
-                        args=step.get("mcp_args", {}),
-                    )
-                    duration = int((datetime.now() - step_start).total_seconds() * 1000)
-
-                    # Check if result indicates failure
-                    if isinstance(result, dict):
-                        success = result.get("success", True)
-                        error = result.get("error")
-                    elif isinstance(result, StepResult):
-                        return result
-                    else:
-                        success = result is not None
-                        error = None if success else "MCP call returned None"
-
-                    return StepResult(
-                        step_id=step_id,
-                        success=success,
-                        output=str(result) if result else "",
-                        duration_ms=duration,
-                        error=error,
-                    )
-                except Exception as e:
-                    duration = int((datetime.now() - step_start).total_seconds() * 1000)
-                    return StepResult(
-                        step_id=step_id,
-                        success=False,
-                        output="",
-                        duration_ms=duration,
-                        error=f"MCP call failed: {e}",
-                    )
+    def _step_python(
+        self,
+        step: Dict,
+        inputs: Dict,
+        agent_callback: Optional[Callable],
+        skill: Dict,
+        step_start: int,
+    ) -> StepResult:
+        """Run a python step in a separate interpreter process."""
+        step_id = step["id"]
+        # Execute Python code via subprocess (sandboxed)
+        # SECURITY: Never use exec() - always subprocess for isolation
+        try:
+            code = render_template(step["cmd"], step.get("_cmd_parsed"), inputs)
+        except KeyError as e:
+            return StepResult(
+                step_id=step_id,
+                success=False,
+                output="",
+                duration_ms=0,
+                error=f"Missing input for code: {e}",
+            )
 
-            else:
+        # Validate working directory with path traversal protection
+        python_working_dir = None
+        python_working_dir_str = step.get("working_dir", ".")
+        if python_working_dir_str != ".":
+            try:
+                python_working_dir_str = render_template(
+                    python_working_dir_str,
+                    step.get("_working_dir_parsed"),
+                    inputs,
+                )
+                python_working_dir = self._validate_path_safety(
+                    python_working_dir_str, "python working_dir"
+                )
+            except ValueError as e:
                 return StepResult(
                     step_id=step_id,
                     success=False,
                     output="",
                     duration_ms=0,
-                    error=f"Unknown step type: {step_type}",
+                    error=str(e),
                 )
 
-        except subprocess.TimeoutExpired:
-            duration = int((datetime.now() - step_start).total_seconds() * 1000)
+        # Execute via subprocess for security isolation
+        result = self._run_streaming(
+            [sys.executable, "-c", code],
+            step_id,
+            timeout=step.get("timeout", 300),
+            cwd=python_working_dir,
+            env=self._step_env(step),
+        )
+
+        duration = (time.perf_counter_ns() - step_start) // 1_000_000
+        return StepResult(
+            step_id=step_id,
+            success=result.returncode == 0,
+            output=result.stdout[-_STEP_OUTPUT_CHARS:] if result.stdout else "OK",
+            duration_ms=duration,
+            error=result.stderr if result.returncode != 0 else None,
+        )
+
+    def _step_agent(
+        self,
+        step: Dict,
+        inputs: Dict,
+        agent_callback: Optional[Callable],
+        skill: Dict,
+        step_start: int,
+    ) -> StepResult:
+        """Delegate a step to the agent callback."""
+        step_id = step["id"]
+        # Delegate to agent callback
+        if not agent_callback:
             return StepResult(
                 step_id=step_id,
                 success=False,
                 output="",
+                duration_ms=0,
+                error="No agent_callback provided for agent step",
+            )
+
+        result = agent_callback("execute_step", step=step, inputs=inputs)
+        duration = (time.perf_counter_ns() - step_start) // 1_000_000
+
+        if isinstance(result, StepResult):
+            return result
+        return StepResult(
+            step_id=step_id,
+            success=True,
+            output=str(result)[:_STEP_OUTPUT_CHARS] if result else "OK",
+            duration_ms=duration,
+        )
+
+    def _step_checkpoint(
+        self,
+        step: Dict,
+        inputs: Dict,
+        agent_callback: Optional[Callable],
+        skill: Dict,
+        step_start: int,
+    ) -> StepResult:
+        """Human-in-the-loop checkpoint (auto-passes without a callback)."""
+        step_id = step["id"]
+        # Human-in-the-loop
+        message = step.get("checkpoint_message", step.get("description", "Continue?"))
+        logger.info("\n  CHECKPOINT: %s", message)
+
+        if agent_callback:
+            result = agent_callback("checkpoint", message=message)
+            duration = (time.perf_counter_ns() - step_start) // 1_000_000
+
+            if isinstance(result, StepResult):
+                return result
+
+            # Assume True means continue
+            return StepResult(
+                step_id=step_id,
+                success=bool(result) if result is not None else True,
+                output="Checkpoint passed",
                 duration_ms=duration,
-                error=f"Command timed out after {step.get('timeout', 300)}s",
+            )
+        else:
+            # Auto-pass in non-interactive mode
+            return StepResult(
+                step_id=step_id,
+                success=True,
+                output="Auto-passed (no callback)",
+                duration_ms=0,
+            )
+
+    def _step_mcp(
+        self,
+        step: Dict,
+        inputs: Dict,
+        agent_callback: Optional[Callable],
+        skill: Dict,
+        step_start: int,
+    ) -> StepResult:
+        """Run an MCP tool call through the agent callback."""
+        step_id = step["id"]
+        # MCP tool call
+        if not agent_callback:
+            return StepResult(
+                step_id=step_id,
+                success=False,
+                output="",
+                duration_ms=0,
+                error="No agent_callback provided for MCP step",
+            )
+
+        try:
+            result = agent_callback(
+                "mcp_call",
+                server=step.get("mcp_server"),
+                tool=step.get("mcp_tool"),
+                args=step.get("mcp_args", {}),
+            )
+            duration = (time.perf_counter_ns() - step_start) // 1_000_000
+
+            # Check if result indicates failure
+            if isinstance(result, dict):
+                success = result.get("success", True)
+                error = result.get("error")
+            elif isinstance(result, StepResult):
+                return result
+            else:
+                success = result is not None
+                error = None if success else "MCP call returned None"
+
+            return StepResult(
+                step_id=step_id,
+                success=success,
+                output=str(result)[:_STEP_OUTPUT_CHARS] if result else "",
+                duration_ms=duration,
+                error=error,
             )
         except Exception as e:
-            duration = int((datetime.now() - step_start).total_seconds() * 1000)
+            duration = (time.perf_counter_ns() - step_start) // 1_000_000
             return StepResult(
                 step_id=step_id,
                 success=False,
                 output="",
                 duration_ms=duration,
-                error=str(e),
+                error=f"MCP call failed: {e}",
             )
 
+    def _run_streaming(
+        self,
+        args: Any,
+        step_id: str,
+        timeout: int,
+        cwd: Optional[Path],
+        env: Optional[Dict[str, str]],
+        shell: bool = False,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a step process, reading its output as it is produced.
+
+        Each output line is logged at DEBUG level as it arrives; only the last
+        _OUTPUT_TAIL_BYTES bytes of stdout/stderr are kept in memory, and
+        they are decoded (to at most _OUTPUT_TAIL_LINES lines) once the
+        process is done.
+
+        The process runs in its own session so a timeout also kills whatever
+        it started in the background; the timeout covers both the process
+        and its output pipes (a grandchild can keep those open after exit).
+
+        Raises:
+            subprocess.TimeoutExpired: If the process exceeds timeout (it is killed)
+        """
+        deadline = time.monotonic() + timeout
+        proc = subprocess.Popen(
+            args,
+            shell=shell,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,  # Unbuffered: each read returns what is available
+            cwd=cwd,
+            env=env,
+            start_new_session=os.name == "posix",
+        )
+        stdout_tail = bytearray()
+        stderr_tail = bytearray()
+        reader_errors: List[BaseException] = []
+        readers = [
+            threading.Thread(
+                target=_drain_pipe,
+                args=(proc.stdout, stdout_tail, step_id, reader_errors),
+                daemon=True,
+            ),
+            threading.Thread(
+                target=_drain_pipe,
+                args=(proc.stderr, stderr_tail, step_id, reader_errors),
+                daemon=True,
+            ),
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            proc.wait(timeout=timeout)
+            # The output is complete once both pipes close, within the same
+            # timeout
+            for reader in readers:
+                reader.join(timeout=max(0.0, deadline - time.monotonic()))
+            if any(reader.is_alive() for reader in readers):
+                raise subprocess.TimeoutExpired(args, timeout)
+        except BaseException:
+            # Timeout, Ctrl-C or any other error: the step's processes must not
+            # outlive it (they don't get the terminal's SIGINT in their session)
+            _kill_session(proc)
+            proc.wait()
+            for reader in readers:
+                reader.join(timeout=1)
+            raise
+        if reader_errors:
+            raise reader_errors[0]  # Output incomplete: fails the step
+
+        return subprocess.CompletedProcess(
+            args,
+            proc.returncode,
+            _output_tail(stdout_tail),
+            _output_tail(stderr_tail),
+        )
+
+    def _step_env(self, step: Dict) -> Optional[Dict[str, str]]:
+        """
+        Environment for a step subprocess.
+
+        None (inherit this process's environment as-is) unless the step sets
+        variables; only then is a merged copy built.
+        """
+        step_env = step.get("env")
+        if not step_env:
+            return None
+        return {**os.environ, **step_env}
+
+    def _get_path_executables(self) -> frozenset:
+        """Return the names of executables on PATH (rescanned after the TTL)."""
+        now = time.monotonic()
+        if self._path_executables is None or now >= self._path_executables_expires:
+            names = set()
+            for directory in os.environ.get("PATH", os.defpath).split(os.pathsep):
+                try:
+                    with os.scandir(directory or os.curdir) as entries:
+                        for entry in entries:
+                            if entry.name in names:
+                                continue  # Earlier PATH entry already has it
+                            if entry.is_file() and os.access(entry.path, os.X_OK):
+                                names.add(entry.name)
+                except OSError:
+                    continue  # Missing or unreadable PATH entry
+            self._path_executables = frozenset(names)
+            self._path_executables_expires = now + _PREREQ_TTL_S
+        return self._path_executables
+
+    def _check_prereq_memo(
+        self, prereq: Dict, memo: Dict[Tuple, Tuple[bool, str]]
+    ) -> Tuple[bool, str]:
+        """
+        _check_prereq with memoization.
+
+        memo holds results for the current execute_skill call. Across calls
+        only command_exists results are reused (for _PREREQ_TTL_S, which
+        also bounds the age of the PATH index they come from): files and
+        environment variables can change between runs, e.g. an earlier
+        workflow phase creating the file a later phase requires.
+        """
+        try:
+            key = (prereq["check"], tuple(prereq["args"]))
+            hash(key)
+        except TypeError:
+            return self._check_prereq(prereq)  # Unhashable args: no caching
+
+        result = memo.get(key)
+        if result is not None:
+            return result
+
+        if key[0] != "command_exists":
+            result = self._check_prereq(prereq)
+        else:
+            now = time.monotonic()
+            cached = self._prereq_results.get(key)
+            if cached is not None and cached[0] > now:
+                result = cached[1]
+            else:
+                result = self._check_prereq(prereq)
+                self._prereq_results[key] = (now + _PREREQ_TTL_S, result)
+
+        memo[key] = result
+        return result
+
     def _check_prereq(self, prereq: Dict) -> tuple[bool, str]:
         """Check pre-requisite."""
         check_type = prereq["check"]
@@ -905,8 +2322,15 @@ class SkillController:
 
         if check_type == "command_exists":
             cmd = args[0]
-            # Use shutil.which - cross-platform and secure (no shell needed)
-            found = shutil.which(cmd) is not None
+            # Windows (PATHEXT) and explicit paths go through shutil.which
+            if os.name == "nt" or os.sep in cmd or (os.altsep and os.altsep in cmd):
+                found = shutil.which(cmd) is not None
+            else:
+                # The index answers hits; a miss is re-checked on PATH in
+                # case the command was installed after the index was built
+                found = (
+                    cmd in self._get_path_executables() or shutil.which(cmd) is not None
+                )
             return found, f"Command '{cmd}' exists"
 
         elif check_type == "file_exists":
@@ -923,14 +2347,32 @@ class SkillController:
 
         return False, f"Unknown check type: {check_type}"
 
+    def _verify_parallel(
+        self, checks: List[Dict], inputs: Dict
+    ) -> List[Tuple[bool, str]]:
+        """
+        Run verification checks concurrently (skills with parallel_verification).
+
+        Results come back in declaration order, up to and including the first
+        failed check; checks that have not started by then are cancelled.
+        """
+        outcomes: List[Tuple[bool, str]] = []
+        with ThreadPoolExecutor(max_workers=min(8, len(checks))) as executor:
+            futures = [executor.submit(self._verify, check, inputs) for check in checks]
+            for future in futures:
+                outcomes.append(future.result())
+                if not outcomes[-1][0]:
+                    executor.shutdown(cancel_futures=True)
+                    break
+        return outcomes
+
     def _verify(self, check: Dict, inputs: Dict) -> tuple[bool, str]:
         """Run verification check."""
         check_type = check.get("type", "bash")
 
         if check_type == "bash":
-            cmd = check["cmd"]
             try:
-                cmd = cmd.format(**inputs)
+                cmd = render_template(check["cmd"], check.get("_cmd_parsed"), inputs)
             except KeyError as e:
                 return False, f"Missing input for verification: {e}"
 
@@ -940,68 +2382,81 @@ class SkillController:
             return result.returncode == expected, f"Exit code: {result.returncode}"
 
         elif check_type == "file_exists":
-            path = check["path"].format(**inputs)
+            path = render_template(check["path"], check.get("_path_parsed"), inputs)
             exists = Path(path).exists()
             return exists, f"File exists: {path}"
 
         elif check_type == "dir_exists":
-            path = check["path"].format(**inputs)
+            path = render_template(check["path"], check.get("_path_parsed"), inputs)
             exists = Path(path).is_dir()
             return exists, f"Directory exists: {path}"
 
         elif check_type == "json_valid":
-            path = check["path"].format(**inputs)
+            path = render_template(check["path"], check.get("_path_parsed"), inputs)
             try:
-                with open(path) as f:
-                    json.load(f)
+                _json_loads(Path(path).read_bytes())
                 return True, f"Valid JSON: {path}"
             except Exception as e:
                 return False, f"Invalid JSON: {e}"
 
         return False, f"Unknown verification type: {check_type}"
 
-    def _rollback(self, skill: Dict, steps_completed: List[str], inputs: Dict):
-        """Execute rollback steps."""
+    def _rollback(self, skill: Dict, steps_completed: Set[str], inputs: Dict):
+        """Execute rollback steps (steps_completed is a set: one lookup per entry)."""
         logger.warning(f"\nROLLBACK: Reverting changes...")
 
         rollback_steps = skill.get("rollback", [])
         for step in rollback_steps:
             # Only rollback if step was completed
             if step["id"] in steps_completed or step["id"] == "cleanup":
-                logger.info(f"  Rolling back: {step['id']}")
+                logger.info("  Rolling back: %s", step["id"])
                 try:
-                    cmd = step["cmd"].format(**inputs)
+                    cmd = render_template(step["cmd"], step.get("_cmd_parsed"), inputs)
                     # shell=True needed for string commands (trusted source: skill.json)
                     subprocess.run(cmd, shell=True, capture_output=True, timeout=60)
                 except Exception as e:
                     logger.error(f"  Rollback failed: {e}")
 
+    def _write_log_record(
+        self, execution_log: ExecutionLog, record: Dict[str, Any], last: bool = False
+    ) -> None:
+        """Queue one JSON Lines record for the execution log's file."""
+        if execution_log.log_file is None:
+            return
+        # Serialize now (the caller may keep mutating what it passed in);
+        # the line is appended in the background
+        _queue_log_write(execution_log.log_file, _dump_record(record), last)
+
+    def flush_logs(self) -> None:
+        """Block until every queued execution log record has been written."""
+        _flush_logs()
+
+    def close(self) -> None:
+        """Write pending execution logs and the skill cache (call when done)."""
+        _flush_logs()
+        self._skill_cache.save()
+
     def _finalize_result(
         self,
         skill: Dict,
         steps_completed: List[str],
         steps_failed: List[str],
-        execution_log: Dict,
+        execution_log: ExecutionLog,
         start_time: datetime,
+        start_ns: int,
         success: bool,
         error: Optional[str] = None,
     ) -> SkillResult:
         """Finalize execution and save logs."""
-        duration = int((datetime.now() - start_time).total_seconds() * 1000)
-
-        execution_log["success"] = success
-        execution_log["total_duration_ms"] = duration
-        execution_log["steps_completed"] = steps_completed
-        execution_log["steps_failed"] = steps_failed
-
-        # Save log
-        timestamp = start_time.strftime("%Y%m%d_%H%M%S")
-        log_file = self.output_dir / f"{skill['name']}_{timestamp}.json"
+        duration = (time.perf_counter_ns() - start_ns) // 1_000_000
 
-        with open(log_file, "w", encoding="utf-8") as f:
-            json.dump(execution_log, f, indent=2, ensure_ascii=False)
+        execution_log.success = success
+        execution_log.total_duration_ms = duration
+        execution_log.steps_completed = steps_completed
+        execution_log.steps_failed = steps_failed
 
-        logger.info(f"\nLog saved: {log_file}")
+        # Closing record: the log file is complete once it is written
+        self._write_log_record(execution_log, execution_log.summary(), last=True)
 
         return SkillResult(
             success=success,
@@ -1010,13 +2465,25 @@ class SkillController:
             steps_completed=steps_completed,
             steps_failed=steps_failed,
             total_duration_ms=duration,
-            log_file=str(log_file),
+            log_file=execution_log.log_file,
             error=error,
         )
 
 
 # === CLI INTERFACE ===
 
+# --info output, written with a single stdout write
+_INFO_TMPL = (
+    "\nSkill: %s v%s\n"
+    "Autonomy: %s\n"
+    "Description: %s\n"
+    "\nInputs:\n"
+    "%s"
+    "\nSteps: %d\n"
+    "%s"
+    "\nVerification: %d checks\n"
+)
+
 
 def main():
     """CLI for testing skill controller."""
@@ -1039,6 +2506,21 @@ def main():
     parser.add_argument("--reload", action="store_true", help="Reload skills from disk")
 
     args = parser.parse_args()
+    configure_logging()
+
+    # Nothing to do: show help without scanning the registry
+    if not (args.list or args.info or args.execute or args.reload):
+        parser.print_help()
+        return 0
+
+    # Bad --inputs fails before any controller setup
+    inputs: Dict[str, Any] = {}
+    if args.execute:
+        try:
+            inputs = _json_loads(args.inputs)
+        except ValueError as e:  # json/orjson JSONDecodeError
+            print(f"Invalid JSON inputs: {e}")
+            return 1
 
     controller = SkillController()
 
@@ -1046,48 +2528,50 @@ def main():
         controller.reload_registry()
 
     if args.list:
-        skills = controller.list_skills()
+        skills = controller.list_skills_with_info()
         if skills:
             print("\nAvailable skills:")
-            for skill in skills:
-                info = controller.get_skill_info(skill)
-                if info:
-                    desc = info.get("description", "No description")[:50]
-                    print(f"  - {skill} (v{info['version']}): {desc}")
+            for info in skills:
+                print(f"  - {info['name']} (v{info['version']}): {info['description']}")
         else:
             print("\nNo skills found. Create skills in SKILLS/<skill-name>/skill.json")
 
     elif args.info:
         info = controller.get_skill_info(args.info)
         if info:
-            print(f"\nSkill: {info['name']} v{info['version']}")
-            print(f"Autonomy: {info['autonomy']}")
-            print(f"Description: {info.get('description', 'N/A')}")
-            print(f"\nInputs:")
-            for name, spec in info.get("inputs", {}).items():
-                req = "(required)" if spec.get("required") else "(optional)"
-                print(f"  - {name}: {spec['type']} {req}")
-            print(f"\nSteps: {len(info['steps'])}")
-            for step in info["steps"]:
-                print(f"  - {step['id']} ({step['type']})")
-            print(f"\nVerification: {len(info['verification'])} checks")
+            inputs_block = "".join(
+                f"  - {name}: {spec['type']} "
+                f"{'(required)' if spec.get('required') else '(optional)'}\n"
+                for name, spec in info.get("inputs", {}).items()
+            )
+            steps_block = "".join(
+                f"  - {step['id']} ({step['type']})\n" for step in info["steps"]
+            )
+            sys.stdout.write(
+                _INFO_TMPL
+                % (
+                    info["name"],
+                    info["version"],
+                    info["autonomy"],
+                    info.get("description", "N/A"),
+                    inputs_block,
+                    len(info["steps"]),
+                    steps_block,
+                    len(info["verification"]),
+                )
+            )
         else:
             print(f"\nSkill '{args.info}' not found")
 
     elif args.execute:
-        try:
-            inputs = json.loads(args.inputs)
-        except json.JSONDecodeError as e:
-            print(f"Invalid JSON inputs: {e}")
-            return 1
-
         result = controller.execute_skill(args.execute, inputs, dry_run=args.dry_run)
+        controller.flush_logs()  # The log file exists before its path is printed
 
         print(f"\n{'=' * 60}")
         if result.success:
             print(f"SUCCESS: Skill '{result.skill_name}' completed")
             print(f"Duration: {result.total_duration_ms}ms")
-            print(f"Steps: {len(result.steps_completed)} completed")
+            print(f"Steps: {result.completed_count} completed")
         else:
             print(f"FAILED: {result.error}")
             print(f"Steps completed: {result.steps_completed}")
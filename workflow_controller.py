@@ -13,39 +13,105 @@ Version: 1.0.0
 Created: 2026-01-19
 """
 
+import hashlib
+import importlib.util
 import json
 import logging
 import sys
 import os
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Callable
-from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, Optional, List, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
 # Import SkillController
-from skill_controller import SkillController, SkillResult
+from skill_controller import (
+    SkillController,
+    SkillResult,
+    configure_logging,
+    load_compiled_validator,
+    parse_template,
+    render_template,
+)
+
+# Bytes at the end of PROJECT_CONTEXT.md searched for its "## Next Steps"
+# section (not found there: the entry is appended)
+_CONTEXT_TAIL_BYTES = 64 * 1024
+
+# Conditional import for jsonschema, deferred to the first validation
+HAS_JSONSCHEMA = importlib.util.find_spec("jsonschema") is not None
+jsonschema = None  # type: ignore  # Set by _import_jsonschema()
+
+
+def _import_jsonschema() -> Any:
+    """Import jsonschema on first use (only call when HAS_JSONSCHEMA)."""
+    global jsonschema
+    if jsonschema is None:
+        import jsonschema as module
+
+        jsonschema = module
+    return jsonschema
+
 
-# Conditional import for jsonschema
+# Conditional import for fastjsonschema (generates plain-Python validators)
 try:
-    import jsonschema
+    import fastjsonschema
 
-    HAS_JSONSCHEMA = True
+    HAS_FASTJSONSCHEMA = True
 except ImportError:
-    jsonschema = None  # type: ignore
-    HAS_JSONSCHEMA = False
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
-)
+    fastjsonschema = None  # type: ignore
+    HAS_FASTJSONSCHEMA = False
+
+# Conditional import for orjson (faster JSON parsing/serialization)
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None  # type: ignore
+    HAS_ORJSON = False
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError: same except clauses work
+_json_loads: Callable[[Any], Any] = orjson.loads if HAS_ORJSON else json.loads  # type: ignore[union-attr]
+
+
+def _dump_state(data: Dict[str, Any]) -> bytes:
+    """Serialize workflow state as indented UTF-8 JSON."""
+    if HAS_ORJSON:
+        # OPT_NON_STR_KEYS: like json, write non-str dict keys as strings
+        return orjson.dumps(  # type: ignore[union-attr]
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,  # type: ignore[union-attr]
+        )
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _dump_line(data: Dict[str, Any]) -> bytes:
+    """Serialize one record as a compact UTF-8 JSON Lines line."""
+    if HAS_ORJSON:
+        return orjson.dumps(  # type: ignore[union-attr]
+            data,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,  # type: ignore[union-attr]
+        )
+    line = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return (line + "\n").encode("utf-8")
+
+
+# Workflow files already parsed and validated in this process, shared by every
+# WorkflowController: path -> (mtime_ns, size, schema digest, workflow)
+_WORKFLOW_CACHE: Dict[str, Tuple[int, int, Optional[str], Dict[str, Any]]] = {}
+
 logger = logging.getLogger("WorkflowController")
+# Library use: silent unless the application configures logging (see main)
+logger.addHandler(logging.NullHandler())
 
 
-class WorkflowStatus(Enum):
-    """Workflow execution status."""
+class WorkflowStatus(StrEnum):
+    """Workflow execution status (members are the status strings)."""
 
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
@@ -85,9 +151,34 @@ class WorkflowResult:
     error: Optional[str] = None
 
     def to_dict(self) -> Dict:
-        result = asdict(self)
-        result["status"] = self.status.value
-        return result
+        # Shallow, built by hand: asdict() recurses and deep-copies lists
+        return {
+            "success": self.success,
+            "workflow_name": self.workflow_name,
+            "version": self.version,
+            "status": self.status,
+            "phases_completed": self.phases_completed,
+            "phases_failed": self.phases_failed,
+            "phases_skipped": self.phases_skipped,
+            "current_phase": self.current_phase,
+            "total_duration_ms": self.total_duration_ms,
+            "state_file": self.state_file,
+            "error": self.error,
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class _Phase:
+    """A workflow phase, extracted once at load time (see _compile_phases)."""
+
+    name: str
+    skill: str
+    condition: Optional[Dict[str, Any]]
+    check: Optional[Callable[[Dict, Dict], bool]]  # Compiled condition
+    inputs: Dict[str, Any]
+    on_failure: str
+    checkpoint: bool
+    checkpoint_message: str
 
 
 @dataclass
@@ -107,7 +198,20 @@ class WorkflowState:
     error: Optional[str] = None
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # Shallow, built by hand (see WorkflowResult.to_dict)
+        return {
+            "workflow_name": self.workflow_name,
+            "version": self.version,
+            "status": self.status,
+            "current_phase_index": self.current_phase_index,
+            "inputs": self.inputs,
+            "phases_completed": self.phases_completed,
+            "phases_failed": self.phases_failed,
+            "phase_outputs": self.phase_outputs,
+            "started_at": self.started_at,
+            "updated_at": self.updated_at,
+            "error": self.error,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict) -> "WorkflowState":
@@ -132,6 +236,7 @@ class WorkflowController:
         schema_path: str = "schemas/workflow-schema.json",
         state_dir: str = "outputs/workflow_state",
         base_path: Optional[str] = None,
+        check_skills: bool = True,
     ):
         # Determine base path (priority: explicit param > env var > cwd)
         if base_path:
@@ -150,57 +255,150 @@ class WorkflowController:
         # IMPORTANT: Load schema regardless of jsonschema availability
         self.schema = None
         if self.schema_path.exists():
-            with open(self.schema_path) as f:
-                self.schema = json.load(f)
-            if not HAS_JSONSCHEMA:
+            self.schema = _json_loads(self.schema_path.read_bytes())
+            if not HAS_JSONSCHEMA and not HAS_FASTJSONSCHEMA:
                 logger.warning(
                     "Schema loaded but jsonschema not installed. "
                     "Validation will be enforced - install jsonschema or remove schema file."
                 )
 
-        # Initialize SkillController
-        self.skill_controller = SkillController(base_path=str(self.base_path))
+        # Fast path: compiled validator, cached on disk between runs
+        self._fast_validate: Optional[Callable[[Any], Any]] = None
+        if self.schema and HAS_FASTJSONSCHEMA:
+            try:
+                # jsonschema re-validates failures for the readable error, so
+                # the generated fast path only needs a pass/fail answer.
+                self._fast_validate = load_compiled_validator(
+                    self.schema, detailed_exceptions=not HAS_JSONSCHEMA
+                )
+            except Exception as e:
+                logger.warning(f"Could not compile schema with fastjsonschema: {e}")
+
+        # Identifies the schema workflows in _WORKFLOW_CACHE were validated with
+        self._schema_digest = (
+            hashlib.sha256(
+                json.dumps(self.schema, sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            if self.schema
+            else None
+        )
 
-        # Load all workflows into registry
+        # SkillController, created on first use (see skill_controller). With
+        # check_skills=False (CLI --list/--info) the registry load doesn't
+        # check that phase skills exist, so no skill is discovered or loaded
+        self._skill_controller: Optional[SkillController] = None
+        self._check_skills = check_skills
+
+        # file_exists condition results; only valid while no phase has run
+        # since (phases create and delete files), see execute_workflow
+        self._path_exists_cache: Dict[str, bool] = {}
+
+        # What each workflow's state log already holds for the current run:
+        # name -> (started_at, phase_outputs, len(completed), len(failed))
+        self._state_written: Dict[str, Tuple[str, Dict[str, Any], int, int]] = {}
+
+        # Load all workflows into registry; their phases, compiled for
+        # execute_workflow, are kept apart (get_workflow_info returns the dict)
         self.registry: Dict[str, Dict] = {}
+        self._compiled_phases: Dict[str, List[_Phase]] = {}
         self._load_registry()
 
         logger.info(
-            f"WorkflowController initialized with {len(self.registry)} workflows"
+            "WorkflowController initialized with %s workflows", len(self.registry)
         )
 
+    @property
+    def skill_controller(self) -> SkillController:
+        """SkillController that runs the phase skills (created on first use)."""
+        if self._skill_controller is None:
+            self._skill_controller = SkillController(base_path=str(self.base_path))
+        return self._skill_controller
+
     def _load_registry(self) -> None:
         """Load all workflows and validate against schema."""
         if not self.workflows_dir.exists():
             logger.warning(f"Workflows directory not found: {self.workflows_dir}")
             return
 
-        for workflow_file in self.workflows_dir.glob("*.json"):
+        # scandir: name filter and is_file() come from the directory entry
+        workflow_files: List[Tuple[str, os.stat_result]] = []
+        with os.scandir(self.workflows_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    try:
+                        workflow_files.append((entry.path, entry.stat()))
+                    except OSError:
+                        continue  # Removed while listing
+
+        # Files parsed + validated earlier in this process, unchanged since
+        cached: Dict[str, Dict[str, Any]] = {}
+        for path, st in workflow_files:
+            hit = _WORKFLOW_CACHE.get(path)
+            if hit is not None and hit[:3] == (
+                st.st_mtime_ns,
+                st.st_size,
+                self._schema_digest,
+            ):
+                cached[path] = hit[3]
+
+        # File reads overlap in worker threads; parsing, validation and
+        # registry updates stay on this thread (in directory order)
+        to_read = [path for path, _ in workflow_files if path not in cached]
+        prefetched: Dict[str, Optional[bytes]] = {}
+        if len(to_read) > 1:
+
+            def read(path: str) -> Optional[bytes]:
+                try:
+                    with open(path, "rb") as f:
+                        return f.read()
+                except OSError:
+                    return None  # Reported when read again on this thread
+
+            max_workers = min(32, (os.cpu_count() or 1) * 4, len(to_read))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                prefetched = dict(zip(to_read, executor.map(read, to_read)))
+
+        # Phases across workflows share skills: look each one up once per load
+        # (not per controller, so a reload sees skills added since)
+        skill_exists = (
+            lru_cache(maxsize=None)(self.skill_controller.validate_skill_exists)
+            if self._check_skills
+            else None
+        )
+
+        for workflow_file, st in workflow_files:
             try:
-                with open(workflow_file, encoding="utf-8") as f:
-                    workflow = json.load(f)
-
-                # Validate against schema - ENFORCED if schema exists
-                if self.schema:
-                    if not HAS_JSONSCHEMA:
-                        raise RuntimeError(
-                            "Schema validation required but jsonschema not installed. "
-                            "Run: pip install jsonschema"
-                        )
-                    jsonschema.validate(instance=workflow, schema=self.schema)  # type: ignore[union-attr]
+                workflow = cached.get(workflow_file)
+                if workflow is None:
+                    raw = prefetched.get(workflow_file)
+                    if raw is None:
+                        with open(workflow_file, "rb") as f:
+                            raw = f.read()
+                    workflow = _json_loads(raw)
+
+                    # Validate against schema - ENFORCED if schema exists
+                    if self.schema:
+                        self._validate_schema(workflow)
+
+                    _WORKFLOW_CACHE[workflow_file] = (
+                        st.st_mtime_ns,
+                        st.st_size,
+                        self._schema_digest,
+                        workflow,
+                    )
+
+                # Own copy: the cached dict is shared with other controllers
+                workflow = dict(workflow)
 
                 # Validate all skills exist
-                for phase in workflow.get("phases", []):
-                    skill_name = phase.get("skill")
-                    if not self.skill_controller.validate_skill_exists(skill_name):
-                        logger.warning(
-                            f"Workflow {workflow['name']}: skill '{skill_name}' not found"
-                        )
+                if skill_exists is not None:
+                    self._warn_missing_skills(workflow, skill_exists)
 
+                self._compiled_phases[workflow["name"]] = self._compile_phases(workflow)
                 self.registry[workflow["name"]] = workflow
-                self.registry[workflow["name"]]["_path"] = str(workflow_file)
+                self.registry[workflow["name"]]["_path"] = workflow_file
                 logger.info(
-                    f"  Loaded workflow: {workflow['name']} v{workflow['version']}"
+                    "  Loaded workflow: %s v%s", workflow["name"], workflow["version"]
                 )
 
             except json.JSONDecodeError as e:
@@ -208,14 +406,108 @@ class WorkflowController:
             except RuntimeError as e:
                 logger.error(str(e))
             except Exception as e:
-                if HAS_JSONSCHEMA and jsonschema is not None:
+                if jsonschema is not None:
                     if isinstance(e, jsonschema.ValidationError):
                         logger.error(
                             f"Workflow {workflow_file} failed validation: {e.message}"
                         )
                         continue
+                if HAS_FASTJSONSCHEMA and isinstance(
+                    e, fastjsonschema.JsonSchemaException
+                ):
+                    logger.error(
+                        f"Workflow {workflow_file} failed validation: {e.message}"
+                    )
+                    continue
                 logger.error(f"Failed to load {workflow_file}: {e}")
 
+    def _warn_missing_skills(
+        self, workflow: Dict[str, Any], skill_exists: Callable[[str], bool]
+    ) -> None:
+        """Warn about phases whose skill isn't in the skill registry."""
+        for phase in workflow.get("phases", []):
+            skill_name = phase.get("skill")
+            if not skill_exists(skill_name):
+                logger.warning(
+                    f"Workflow {workflow['name']}: skill '{skill_name}' not found"
+                )
+
+    def _compile_phases(self, workflow: Dict[str, Any]) -> List[_Phase]:
+        """Extract phase fields (with their defaults) once per workflow."""
+        return [
+            _Phase(
+                name=phase["name"],
+                skill=phase["skill"],
+                condition=phase.get("condition"),
+                check=(
+                    self._compile_condition(phase["condition"])
+                    if phase.get("condition")
+                    else None
+                ),
+                inputs=phase.get("inputs", {}),
+                on_failure=phase.get("on_failure", "stop"),
+                checkpoint=phase.get("checkpoint", False),
+                checkpoint_message=phase.get(
+                    "checkpoint_message",
+                    f"Phase '{phase['name']}' completed. Continue?",
+                ),
+            )
+            for phase in workflow.get("phases", [])
+        ]
+
+    def validate_workflow_file(self, workflow_file: str) -> Optional[str]:
+        """
+        Validate one workflow file against the schema.
+
+        Returns:
+            None if the file is valid, otherwise the detailed error message
+        """
+        try:
+            with open(workflow_file, "rb") as f:
+                workflow = _json_loads(f.read())
+        except OSError as e:
+            return f"Could not read {workflow_file}: {e}"
+        except json.JSONDecodeError as e:
+            return f"Invalid JSON: {e}"
+
+        if not self.schema:
+            return None
+        try:
+            self._validate_schema(workflow)
+        except RuntimeError as e:
+            return str(e)
+        except Exception as e:
+            # jsonschema.ValidationError / fastjsonschema.JsonSchemaException
+            return getattr(e, "message", None) or str(e)
+        return None
+
+    def _validate_schema(self, workflow: Dict[str, Any]) -> None:
+        """
+        Validate a workflow definition against the schema.
+
+        Uses the compiled fastjsonschema validator when available. On failure,
+        jsonschema (if installed) re-validates to raise its richer error.
+
+        Raises:
+            RuntimeError: If no validation backend is installed
+            jsonschema.ValidationError / fastjsonschema.JsonSchemaException
+        """
+        if self._fast_validate is not None:
+            try:
+                self._fast_validate(workflow)
+                return
+            except fastjsonschema.JsonSchemaException:  # type: ignore[union-attr]
+                if not HAS_JSONSCHEMA:
+                    raise
+                # Fall through: jsonschema gives the more detailed report
+
+        if not HAS_JSONSCHEMA:
+            raise RuntimeError(
+                "Schema validation required but jsonschema not installed. "
+                "Run: pip install jsonschema"
+            )
+        _import_jsonschema().validate(instance=workflow, schema=self.schema)
+
     def list_workflows(self) -> List[str]:
         """Return list of available workflows."""
         return sorted(self.registry.keys())
@@ -229,66 +521,190 @@ class WorkflowController:
         exists = workflow_name in self.registry
         if not exists:
             logger.error(f"WORKFLOW NOT FOUND: '{workflow_name}'")
-            logger.info(f"Available workflows: {self.list_workflows()}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Available workflows: %s", self.list_workflows())
         return exists
 
     def _check_condition(
         self, condition: Dict, inputs: Dict, phase_outputs: Dict
     ) -> bool:
         """Evaluate phase condition."""
+        return self._compile_condition(condition)(inputs, phase_outputs)
+
+    def _compile_condition(self, condition: Dict) -> Callable[[Dict, Dict], bool]:
+        """
+        Turn a phase condition into a check(inputs, phase_outputs) callable.
+
+        Done once per phase at load time: the condition type is resolved here,
+        so evaluating it is a single call.
+        """
         cond_type = condition.get("type")
         key = condition.get("key")
         value = condition.get("value")
         path = condition.get("path")
 
         if cond_type == "input_equals":
-            return inputs.get(key) == value
+            return lambda inputs, phase_outputs: inputs.get(key) == value
 
         elif cond_type == "input_truthy":
-            return bool(inputs.get(key))
+            return lambda inputs, phase_outputs: bool(inputs.get(key))
 
         elif cond_type == "previous_success":
             # Check if previous phase succeeded
-            return key in phase_outputs and phase_outputs[key].get("success", False)
+            def previous_success(inputs: Dict, phase_outputs: Dict) -> bool:
+                return key in phase_outputs and phase_outputs[key].get("success", False)
+
+            return previous_success
 
         elif cond_type == "file_exists":
             if path is None:
-                return False
-            formatted_path = path.format(**inputs)
-            return Path(formatted_path).exists()
+                return lambda inputs, phase_outputs: False
+
+            path_parsed = parse_template(path)
 
-        return True  # Default: execute
+            def file_exists(inputs: Dict, phase_outputs: Dict) -> bool:
+                formatted_path = render_template(path, path_parsed, inputs)
+                exists = self._path_exists_cache.get(formatted_path)
+                if exists is None:
+                    exists = Path(formatted_path).exists()
+                    self._path_exists_cache[formatted_path] = exists
+                return exists
+
+            return file_exists
+
+        return lambda inputs, phase_outputs: True  # Default: execute
 
     def _save_state(self, state: WorkflowState) -> str:
-        """Save workflow state for resume."""
+        """
+        Save workflow state for resume.
+
+        State is kept in two files: {name}_state.jsonl, an append-only log
+        (the full state when a run first saves, then one line per save with
+        only the new phase outputs and results), and {name}_status.json with
+        the small fields that change on every save. Each save therefore
+        writes only what changed, not every phase output again.
+        """
         state.updated_at = datetime.now().isoformat()
-        state_file = self.state_dir / f"{state.workflow_name}_state.json"
+        name = state.workflow_name
+        state_file = self.state_dir / f"{name}_state.jsonl"
+
+        written = self._state_written.get(name)
+        if written is None or written[0] != state.started_at or not state_file.exists():
+            # First save of this run: start the log with the full state.
+            # Written to a temp file and renamed so a crash never leaves a
+            # truncated log in place of the previous run's.
+            tmp_path = state_file.with_suffix(".tmp")
+            tmp_path.write_bytes(
+                _dump_line(
+                    {
+                        "workflow_name": name,
+                        "version": state.version,
+                        "inputs": state.inputs,
+                        "started_at": state.started_at,
+                        "phases_completed": state.phases_completed,
+                        "phases_failed": state.phases_failed,
+                        "phase_outputs": state.phase_outputs,
+                    }
+                )
+            )
+            os.replace(tmp_path, state_file)
+        else:
+            _, outputs, n_completed, n_failed = written
+            delta: Dict[str, Any] = {}
+            new_outputs = {
+                key: value
+                for key, value in state.phase_outputs.items()
+                if key not in outputs or outputs[key] is not value
+            }
+            if new_outputs:
+                delta["phase_outputs"] = new_outputs
+            if len(state.phases_completed) > n_completed:
+                delta["phases_completed"] = state.phases_completed[n_completed:]
+            if len(state.phases_failed) > n_failed:
+                delta["phases_failed"] = state.phases_failed[n_failed:]
+            if delta:
+                with open(state_file, "ab") as f:
+                    f.write(_dump_line(delta))
+
+        self._state_written[name] = (
+            state.started_at,
+            dict(state.phase_outputs),
+            len(state.phases_completed),
+            len(state.phases_failed),
+        )
 
-        with open(state_file, "w", encoding="utf-8") as f:
-            json.dump(state.to_dict(), f, indent=2, ensure_ascii=False)
+        status_file = self.state_dir / f"{name}_status.json"
+        tmp_path = status_file.with_suffix(".tmp")
+        tmp_path.write_bytes(
+            _dump_state(
+                {
+                    "started_at": state.started_at,
+                    "status": state.status,
+                    "current_phase_index": state.current_phase_index,
+                    "updated_at": state.updated_at,
+                    "error": state.error,
+                }
+            )
+        )
+        os.replace(tmp_path, status_file)
 
         return str(state_file)
 
     def _load_state(self, workflow_name: str) -> Optional[WorkflowState]:
-        """Load workflow state for resume."""
-        state_file = self.state_dir / f"{workflow_name}_state.json"
+        """Load workflow state for resume (replays the state log)."""
+        state_file = self.state_dir / f"{workflow_name}_state.jsonl"
+        status_file = self.state_dir / f"{workflow_name}_status.json"
 
-        if not state_file.exists():
-            return None
+        if not state_file.exists() or not status_file.exists():
+            return self._load_legacy_state(workflow_name)
 
         try:
-            with open(state_file, encoding="utf-8") as f:
-                data = json.load(f)
+            lines = state_file.read_bytes().splitlines()
+            data = _json_loads(lines[0])
+            for line in lines[1:]:
+                try:
+                    delta = _json_loads(line)
+                except json.JSONDecodeError:
+                    break  # Torn last line (interrupted write): ignore it
+                data["phase_outputs"].update(delta.get("phase_outputs", {}))
+                data["phases_completed"].extend(delta.get("phases_completed", []))
+                data["phases_failed"].extend(delta.get("phases_failed", []))
+            status = _json_loads(status_file.read_bytes())
+            if status.get("started_at", data["started_at"]) != data["started_at"]:
+                # Interrupted between the two files: they belong to different runs
+                logger.error("Failed to load state: state log and status do not match")
+                return None
+            data.update(status)
             return WorkflowState.from_dict(data)
         except Exception as e:
             logger.error(f"Failed to load state: {e}")
             return None
 
+    def _load_legacy_state(self, workflow_name: str) -> Optional[WorkflowState]:
+        """
+        Load a {name}_state.json saved by older versions (one JSON document).
+
+        Lets a workflow paused before the upgrade resume; its next save
+        starts the state log and _clear_state removes the old file.
+        """
+        legacy_file = self.state_dir / f"{workflow_name}_state.json"
+        if not legacy_file.exists():
+            return None
+
+        logger.info("Loading state saved by an older version: %s", legacy_file)
+        try:
+            return WorkflowState.from_dict(_json_loads(legacy_file.read_bytes()))
+        except Exception as e:
+            logger.error(f"Failed to load state: {e}")
+            return None
+
     def _clear_state(self, workflow_name: str) -> None:
         """Clear workflow state after completion."""
-        state_file = self.state_dir / f"{workflow_name}_state.json"
-        if state_file.exists():
-            state_file.unlink()
+        self._state_written.pop(workflow_name, None)
+        for suffix in ("_state.jsonl", "_status.json", "_state.json"):
+            state_file = self.state_dir / f"{workflow_name}{suffix}"
+            if state_file.exists():
+                state_file.unlink()
 
     def _update_project_context(
         self, workflow: Dict, inputs: Dict, result: WorkflowResult
@@ -310,8 +726,6 @@ class WorkflowController:
             return
 
         try:
-            content = context_file.read_text(encoding="utf-8")
-
             # Append workflow execution log
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
             status = "SUCCESS" if result.success else "FAILED"
@@ -327,16 +741,22 @@ class WorkflowController:
 **Duration:** {result.total_duration_ms}ms
 """
 
-            # Insert before last section or append
-            if "## Next Steps" in content:
-                content = content.replace(
-                    "## Next Steps", f"{log_entry}\n## Next Steps"
-                )
-            else:
-                content += log_entry
-
-            context_file.write_text(content, encoding="utf-8")
-            logger.info(f"Updated PROJECT_CONTEXT.md")
+            # Insert before the closing "## Next Steps" section or append.
+            # Only the end of the file is read (the section sits there) and
+            # only the bytes from the insertion point on are written back
+            entry = log_entry.encode("utf-8")
+            with open(context_file, "r+b") as f:
+                size = f.seek(0, os.SEEK_END)
+                tail_start = max(0, size - _CONTEXT_TAIL_BYTES)
+                f.seek(tail_start)
+                tail = f.read()
+                next_steps = tail.rfind(b"## Next Steps")
+                if next_steps == -1:
+                    f.write(entry)  # At the end: tail was read up to it
+                else:
+                    f.seek(tail_start + next_steps)
+                    f.write(entry + b"\n" + tail[next_steps:])
+            logger.info("Updated PROJECT_CONTEXT.md")
 
         except Exception as e:
             logger.warning(f"Failed to update PROJECT_CONTEXT.md: {e}")
@@ -362,7 +782,8 @@ class WorkflowController:
         Returns:
             WorkflowResult with success status and phase details
         """
-        start_time = datetime.now()
+        started_at = datetime.now().isoformat()  # Wall clock: state only
+        start_ns = time.perf_counter_ns()
 
         # ENFORCEMENT: Workflow MUST exist
         if not self.validate_workflow_exists(workflow_name):
@@ -375,26 +796,28 @@ class WorkflowController:
             )
 
         workflow = self.registry[workflow_name]
-        phases = workflow.get("phases", [])
+        phases = self._compiled_phases[workflow_name]
 
-        logger.info(f"\n{'=' * 60}")
-        logger.info(f"EXECUTING WORKFLOW: {workflow_name} v{workflow['version']}")
-        logger.info(f"Phases: {len(phases)}")
-        logger.info(f"{'=' * 60}")
+        logger.info("\n" + "=" * 60)
+        logger.info("EXECUTING WORKFLOW: %s v%s", workflow_name, workflow["version"])
+        logger.info("Phases: %s", len(phases))
+        logger.info("=" * 60)
 
         # Apply input defaults
         for input_name, input_spec in workflow.get("inputs", {}).items():
             if input_name not in inputs and "default" in input_spec:
                 inputs[input_name] = input_spec["default"]
 
+        self._path_exists_cache.clear()
+
         # Initialize or load state
         start_phase = 0
         phase_outputs: Dict[str, Any] = {}
 
         if resume:
             saved_state = self._load_state(workflow_name)
-            if saved_state and saved_state.status == WorkflowStatus.PAUSED.value:
-                logger.info(f"Resuming from phase {saved_state.current_phase_index}")
+            if saved_state and saved_state.status == WorkflowStatus.PAUSED:
+                logger.info("Resuming from phase %s", saved_state.current_phase_index)
                 start_phase = saved_state.current_phase_index
                 phase_outputs = saved_state.phase_outputs
                 inputs = {**saved_state.inputs, **inputs}  # Merge with new inputs
@@ -402,21 +825,21 @@ class WorkflowController:
         state = WorkflowState(
             workflow_name=workflow_name,
             version=workflow["version"],
-            status=WorkflowStatus.IN_PROGRESS.value,
+            status=WorkflowStatus.IN_PROGRESS,
             current_phase_index=start_phase,
             inputs=inputs,
             phases_completed=[],
             phases_failed=[],
             phase_outputs=phase_outputs,
-            started_at=start_time.isoformat(),
-            updated_at=start_time.isoformat(),
+            started_at=started_at,
+            updated_at=started_at,
         )
 
         if dry_run:
             logger.info("\n[DRY RUN] Validating workflow...")
             for i, phase in enumerate(phases):
                 logger.info(
-                    f"  Phase {i + 1}: {phase['name']} -> skill: {phase['skill']}"
+                    "  Phase %s: %s -> skill: %s", i + 1, phase.name, phase.skill
                 )
             return WorkflowResult(
                 success=True,
@@ -432,36 +855,32 @@ class WorkflowController:
 
         try:
             for i, phase in enumerate(phases[start_phase:], start=start_phase):
-                phase_name = phase["name"]
-                skill_name = phase["skill"]
+                phase_name = phase.name
+                skill_name = phase.skill
                 state.current_phase_index = i
 
-                logger.info(f"\n--- Phase {i + 1}/{len(phases)}: {phase_name} ---")
-                logger.info(f"Skill: {skill_name}")
+                logger.info("\n--- Phase %s/%s: %s ---", i + 1, len(phases), phase_name)
+                logger.info("Skill: %s", skill_name)
 
                 # Check condition
-                condition = phase.get("condition")
-                if condition and not self._check_condition(
-                    condition, inputs, phase_outputs
-                ):
-                    logger.info(f"  Skipping: condition not met")
+                if phase.check is not None and not phase.check(inputs, phase_outputs):
+                    logger.info("  Skipping: condition not met")
                     phases_skipped.append(phase_name)
                     continue
 
                 # Merge inputs
-                phase_inputs = {**inputs, **phase.get("inputs", {})}
+                phase_inputs = {**inputs, **phase.inputs}
 
                 # Execute skill
-                phase_start = datetime.now()
+                phase_start = time.perf_counter_ns()
                 skill_result = self.skill_controller.execute_skill(
                     skill_name=skill_name,
                     inputs=phase_inputs,
                     agent_callback=agent_callback,
                     dry_run=False,
                 )
-                phase_duration = int(
-                    (datetime.now() - phase_start).total_seconds() * 1000
-                )
+                phase_duration = (time.perf_counter_ns() - phase_start) // 1_000_000
+                self._path_exists_cache.clear()  # The skill may have changed files
 
                 # Store result
                 phase_outputs[phase_name] = {
@@ -472,16 +891,16 @@ class WorkflowController:
                 if skill_result.success:
                     phases_completed.append(phase_name)
                     state.phases_completed.append(phase_name)
-                    logger.info(f"  Phase completed in {phase_duration}ms")
+                    logger.info("  Phase completed in %sms", phase_duration)
                 else:
                     phases_failed.append(phase_name)
                     state.phases_failed.append(phase_name)
                     logger.error(f"  Phase failed: {skill_result.error}")
 
                     # Handle failure
-                    on_failure = phase.get("on_failure", "stop")
+                    on_failure = phase.on_failure
                     if on_failure == "stop":
-                        state.status = WorkflowStatus.FAILED.value
+                        state.status = WorkflowStatus.FAILED
                         state.error = (
                             f"Phase '{phase_name}' failed: {skill_result.error}"
                         )
@@ -496,9 +915,8 @@ class WorkflowController:
                             phases_failed=phases_failed,
                             phases_skipped=phases_skipped,
                             current_phase=phase_name,
-                            total_duration_ms=int(
-                                (datetime.now() - start_time).total_seconds() * 1000
-                            ),
+                            total_duration_ms=(time.perf_counter_ns() - start_ns)
+                            // 1_000_000,
                             error=f"Phase '{phase_name}' failed",
                         )
                     elif on_failure == "skip_remaining":
@@ -506,19 +924,16 @@ class WorkflowController:
                         break
 
                 # Checkpoint
-                if phase.get("checkpoint", False):
-                    checkpoint_msg = phase.get(
-                        "checkpoint_message",
-                        f"Phase '{phase_name}' completed. Continue?",
-                    )
-                    logger.info(f"\n  CHECKPOINT: {checkpoint_msg}")
+                if phase.checkpoint:
+                    checkpoint_msg = phase.checkpoint_message
+                    logger.info("\n  CHECKPOINT: %s", checkpoint_msg)
 
                     # Save state before checkpoint
-                    state.status = WorkflowStatus.PAUSED.value
+                    state.status = WorkflowStatus.PAUSED
                     state.current_phase_index = i + 1
                     state.phase_outputs = phase_outputs
                     state_file = self._save_state(state)
-                    logger.info(f"  State saved: {state_file}")
+                    logger.info("  State saved: %s", state_file)
 
                     if agent_callback:
                         result = agent_callback("checkpoint", message=checkpoint_msg)
@@ -536,7 +951,7 @@ class WorkflowController:
                             )
 
             # Workflow completed
-            total_duration = int((datetime.now() - start_time).total_seconds() * 1000)
+            total_duration = (time.perf_counter_ns() - start_ns) // 1_000_000
 
             result = WorkflowResult(
                 success=len(phases_failed) == 0,
@@ -556,17 +971,17 @@ class WorkflowController:
             if result.success:
                 self._clear_state(workflow_name)
 
-            logger.info(f"\n{'=' * 60}")
+            logger.info("\n" + "=" * 60)
             logger.info(
-                f"WORKFLOW {'COMPLETED' if result.success else 'FINISHED WITH ERRORS'}"
+                "WORKFLOW %s", "COMPLETED" if result.success else "FINISHED WITH ERRORS"
             )
-            logger.info(f"Duration: {total_duration}ms")
-            logger.info(f"{'=' * 60}")
+            logger.info("Duration: %sms", total_duration)
+            logger.info("=" * 60)
 
             return result
 
         except KeyboardInterrupt:
-            state.status = WorkflowStatus.CANCELLED.value
+            state.status = WorkflowStatus.CANCELLED
             self._save_state(state)
             return WorkflowResult(
                 success=False,
@@ -580,7 +995,7 @@ class WorkflowController:
 
         except Exception as e:
             logger.exception(f"Unexpected error in workflow {workflow_name}")
-            state.status = WorkflowStatus.FAILED.value
+            state.status = WorkflowStatus.FAILED
             state.error = str(e)
             self._save_state(state)
 
@@ -618,10 +1033,15 @@ def main():
     )
     parser.add_argument("--resume", action="store_true", help="Resume from saved state")
     parser.add_argument("--status", type=str, help="Check status of a workflow")
+    parser.add_argument(
+        "--validate", type=str, help="Validate a workflow file against the schema"
+    )
 
     args = parser.parse_args()
+    configure_logging()
 
-    controller = WorkflowController()
+    # Listing and info only read workflow files: skip the skill checks
+    controller = WorkflowController(check_skills=not (args.list or args.info))
 
     if args.list:
         workflows = controller.list_workflows()
@@ -667,9 +1087,16 @@ def main():
         else:
             print(f"\nNo saved state for workflow '{args.status}'")
 
+    elif args.validate:
+        error = controller.validate_workflow_file(args.validate)
+        if error:
+            print(f"\nInvalid workflow {args.validate}: {error}")
+            return 1
+        print(f"\nValid workflow: {args.validate}")
+
     elif args.execute:
         try:
-            inputs = json.loads(args.inputs)
+            inputs = _json_loads(args.inputs)
         except json.JSONDecodeError as e:
             print(f"Invalid JSON inputs: {e}")
             return 1
@@ -686,7 +1113,7 @@ def main():
             print(f"SUCCESS: Workflow '{result.workflow_name}' completed")
         else:
             print(f"FAILED: {result.error}")
-        print(f"Status: {result.status.value}")
+        print(f"Status: {result.status}")
         print(f"Phases completed: {result.phases_completed}")
         print(f"Phases failed: {result.phases_failed}")
         print(f"Duration: {result.total_duration_ms}ms")